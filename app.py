@@ -0,0 +1,592 @@
+# Imports
+import os
+import sys
+import json
+import time
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from flask import Flask, request, jsonify, Response, stream_with_context
+from flask_cors import CORS
+
+# Custom imports
+import scraper
+import bias
+import media
+from metrics import get_drama_index, get_paragraph_drama, score_paragraphs
+from metrics import return_biased_score
+from outlet_bias import NewsOutlet
+from media.yt import download_youtube
+from bias.overall_summary import generate_overall_summary
+import jobs
+
+app = Flask(__name__)
+CORS(app)
+
+# Background media jobs
+_job_queue = None
+_job_queue_lock = threading.Lock()
+
+def get_job_queue():
+    global _job_queue
+    with _job_queue_lock:
+        if _job_queue is None:
+            _job_queue = jobs.JobQueue(jobs.HANDLERS)
+        return _job_queue
+
+def _serves_requests():
+    # Imported by a WSGI server (app:app), this process serves requests. Under
+    # `python main.py` the debug reloader also runs a parent that only watches files,
+    # so main.py starts the queue itself, in the child that serves them.
+    return not getattr(sys.modules["__main__"], "MANAGES_JOB_QUEUE", False)
+
+# Build the queue at startup so jobs queued or running before a restart resume right away
+if _serves_requests():
+    get_job_queue()
+
+@app.route("/fetch-url", methods=["POST"])
+def fetch_url():
+    data = request.get_json()
+    url = data.get("url")
+
+    if not url:
+        return jsonify({
+            "status": "error",
+            "message": "URL not provided"
+        }), 400
+
+    try:
+        content = scraper.get_content(url)
+    except Exception as e:
+        return jsonify({
+            "status": "error",
+            "message": str(e)
+        }), 500
+
+    text = content['text']
+
+    # Segment text into paragraphs and analyze bias
+    paragraphs = bias.segment_paragraphs(text)
+
+    # Per-paragraph drama and the article's drama index, from the same batched inference
+    try:
+        drama_result = score_paragraphs(paragraphs, text=text)
+    except Exception:
+        pass
+
+    # Convert paragraphs to JSON representation
+    paragraphs_json = []
+    reasons = []
+    for para in paragraphs:
+        paragraphs_json.append(para.api_json())
+        if para.is_text_biased_enough and para.reason_biased:
+            reasons.append(para.reason_biased)
+
+    # Calculate drama index as the bias_score
+    try:
+        bias_score, bias_reason = return_biased_score(text)
+    except Exception:
+        bias_score, bias_reason = None, None
+    # Generate an overall summary explaining bias and drama reasoning (best-effort)
+    bias_summary = None
+    drama_summary = None
+    try:
+        bias_summary, drama_summary = generate_overall_summary(
+            title=content.get("title", ""),
+            summary_text=content.get("summary", ""),
+            bias_score=bias_score,
+            drama_index=(drama_result[0] if isinstance(drama_result, list) else drama_result) if 'drama_result' in locals() else None,
+            reasons=reasons,
+        )
+    except Exception:
+        pass
+
+    # Debug: log what we're returning
+    print(f"DEBUG: bias_summary={bias_summary}")
+    print(f"DEBUG: drama_summary={drama_summary}")
+
+
+    return jsonify({
+        "status": "ok",
+        "data": {
+            "paragraphs": paragraphs_json,
+            "bias_score": bias_score,
+            "bias_summary": bias_summary,
+            "drama_summary": drama_summary,
+            "bias_reason": bias_reason,
+            "title": content.get("title", ""),
+            "authors": content.get("authors", []),
+            "date": content.get("date", ""),
+            "top_image": content.get("top_image", ""),
+            "summary": content.get("summary", ""),
+            "keywords": content.get("keywords", []),
+            "reasons": reasons
+        }
+    }), 200
+
+def _stream_event(event, data, fmt):
+    if fmt == "sse":
+        return f"event: {event}\ndata: {json.dumps(data)}\n\n"
+    return json.dumps({"event": event, "data": data}) + "\n"
+
+def _article_scores(text):
+    # Per-paragraph drama, drama index and bias score for the whole article (best-effort)
+    # Drama and bias fail independently, so a Gemini error doesn't drop the drama score
+    drama_index = None
+    paragraph_drama = []
+    try:
+        drama_result = get_paragraph_drama(bias.split_paragraphs(text), text=text)
+        drama_index = drama_result["article"][0]
+        paragraph_drama = drama_result["paragraphs"]
+    except Exception:
+        pass
+    try:
+        bias_score, bias_reason = return_biased_score(text)
+    except Exception:
+        bias_score, bias_reason = None, None
+    return bias_score, bias_reason, drama_index, paragraph_drama
+
+@app.route("/fetch-url-stream", methods=["POST"])
+def fetch_url_stream():
+    """
+    Streaming variant of /fetch-url.
+    Emits article metadata right after scraping, then each paragraph as it finishes
+    (with its index, in completion order), then the article scores and summaries.
+    Newline-delimited JSON by default; pass ?format=sse for Server-Sent Events.
+    """
+    data = request.get_json()
+    url = data.get("url")
+    fmt = request.args.get("format", "ndjson")
+
+    if not url:
+        return jsonify({
+            "status": "error",
+            "message": "URL not provided"
+        }), 400
+
+    try:
+        content = scraper.get_content(url)
+    except Exception as e:
+        return jsonify({
+            "status": "error",
+            "message": str(e)
+        }), 500
+
+    def generate():
+        text = content['text']
+        yield _stream_event("metadata", {
+            "title": content.get("title", ""),
+            "authors": content.get("authors", []),
+            "date": content.get("date", ""),
+            "top_image": content.get("top_image", ""),
+            "summary": content.get("summary", ""),
+            "keywords": content.get("keywords", []),
+            "paragraph_count": len(bias.split_paragraphs(text)),
+        }, fmt)
+
+        # Article-level scores don't depend on the paragraphs, so compute them alongside
+        with ThreadPoolExecutor(max_workers=1) as executor:
+            scores_future = executor.submit(_article_scores, text)
+
+            reasons_by_index = {}
+            try:
+                for index, para in bias.iter_segment_paragraphs(text):
+                    if para.is_text_biased_enough and para.reason_biased:
+                        reasons_by_index[index] = para.reason_biased
+                    yield _stream_event("paragraph", dict(para.api_json(), index=index), fmt)
+            except Exception as e:
+                yield _stream_event("error", {"message": str(e)}, fmt)
+                return
+
+            bias_score, bias_reason, drama_index, paragraph_drama = scores_future.result()
+
+        reasons = [reasons_by_index[i] for i in sorted(reasons_by_index)]
+        yield _stream_event("scores", {
+            "bias_score": bias_score,
+            "bias_reason": bias_reason,
+            "drama_index": drama_index,
+            "reasons": reasons,
+            # Per-paragraph [drama_index, emotions], by paragraph index
+            "paragraph_drama": paragraph_drama,
+        }, fmt)
+
+        bias_summary = None
+        drama_summary = None
+        try:
+            bias_summary, drama_summary = generate_overall_summary(
+                title=content.get("title", ""),
+                summary_text=content.get("summary", ""),
+                bias_score=bias_score,
+                drama_index=drama_index,
+                reasons=reasons,
+            )
+        except Exception:
+            pass
+        yield _stream_event("summary", {
+            "bias_summary": bias_summary,
+            "drama_summary": drama_summary,
+        }, fmt)
+        yield _stream_event("done", {"status": "ok"}, fmt)
+
+    mimetype = "text/event-stream" if fmt == "sse" else "application/x-ndjson"
+    return Response(stream_with_context(generate()), mimetype=mimetype, headers={
+        "Cache-Control": "no-cache",
+        # Stop reverse proxies from buffering the stream
+        "X-Accel-Buffering": "no",
+    })
+
+@app.route("/fetch-outlet-bias", methods=["POST"])
+def fetch_outlet_bias():
+    data = request.get_json()
+    url = data.get("url")
+
+    if not url:
+        return jsonify({
+            "status": "error",
+            "message": "URL not provided"
+        }), 400
+
+    try:
+        outlet = NewsOutlet(url)
+        return jsonify({
+            "status": "ok",
+            "data": outlet.json()
+        }), 200
+    except Exception as e:
+        return jsonify({
+            "status": "error",
+            "message": str(e)
+        }), 500
+
+@app.route("/fetch-audio", methods=["POST"])
+def fetch_audio():
+    if "file" not in request.files:
+        return jsonify({"status": "error", "message": "No file provided"}), 400
+
+    file = request.files["file"]
+    if file.filename == "":
+        return jsonify({"status": "error", "message": "No file selected"}), 400
+
+    filename = file.filename
+    save_path = os.path.join(os.path.dirname(__file__), "user_downloads", filename)
+    file.save(save_path)
+
+    try:
+        transcription = media.transcribe_file(filename)
+        if transcription["error"]:
+            return jsonify({"status": "error", "message": transcription["error"]}), 500
+        text = transcription["text"]
+
+        paragraphs = bias.segment_paragraphs(text)
+        # Per-paragraph drama and the overall drama index, from the same batched inference
+        try:
+            drama_result = score_paragraphs(paragraphs, text=text)
+        except Exception:
+            pass
+        paragraphs_json = []
+        reasons = []
+        for para in paragraphs:
+            paragraphs_json.append(para.json())
+            if para.is_text_biased_enough and para.reason_biased:
+                reasons.append(para.reason_biased)
+
+        # Calculate drama index as the bias_score
+        try:
+            bias_score = drama_result[0] if isinstance(drama_result, list) else drama_result
+        except Exception:
+            bias_score = None
+
+        try:
+            bias_summary, drama_summary = generate_overall_summary(
+                title="",
+                summary_text=text,
+                bias_score=bias_score,
+                drama_index=(drama_result[0] if isinstance(drama_result, list) else drama_result) if 'drama_result' in locals() else None,
+                reasons=reasons,
+            )
+        except Exception:
+            bias_summary = None
+            drama_summary = None
+
+        return jsonify({
+            "status": "ok",
+            "data": {
+                "text": text,
+                "paragraphs": paragraphs_json,
+                "bias_score": bias_score,
+                "summary": text,
+                "reasons": reasons,
+                "bias_summary": bias_summary,
+                "drama_summary": drama_summary,
+                # Chunk count and any chunks missing from the transcript
+                "transcription": media.transcription_report(transcription),
+            }
+        }), 200
+    except Exception as e:
+        return jsonify({"status": "error", "message": str(e)}), 500
+    data = request.get_json()
+    filename = data.get("filename")
+
+    if not filename:
+        return jsonify({
+            "status": "error",
+            "message": "Filename not provided"
+        }), 400
+
+    try:
+        transcription = media.transcribe_file(filename)
+        return jsonify({
+            "status": "ok",
+            "text": transcription["error"] or transcription["text"],
+            "transcription": media.transcription_report(transcription)
+        }), 200
+    except Exception as e:
+        return jsonify({
+            "status": "error",
+            "message": str(e)
+        }), 500
+    
+@app.route("/fetch-video", methods=["POST"])
+def fetch_video():
+    data = request.get_json()
+    if not data or "url" not in data:
+        return jsonify({"status": "error", "message": "No YouTube URL provided"}), 400
+
+    url = data["url"].strip()
+    if not url:
+        return jsonify({"status": "error", "message": "Empty URL"}), 400
+
+    downloads_dir = os.path.join(os.path.dirname(__file__), "user_downloads")
+    os.makedirs(downloads_dir, exist_ok=True)
+
+    try:
+        import yt_dlp
+
+        ydl_opts = {
+            "format": "bestaudio/best",
+            "outtmpl": os.path.join(downloads_dir, "%(id)s.%(ext)s"),
+            "quiet": True,
+            "postprocessors": [{
+                "key": "FFmpegExtractAudio",
+                "preferredcodec": "wav",
+            }],
+        }
+
+        with yt_dlp.YoutubeDL(ydl_opts) as ydl:
+            info = ydl.extract_info(url, download=True)
+            video_id = info["id"]
+
+        audio_filename = f"{video_id}.wav"
+        audio_path = os.path.join(downloads_dir, audio_filename)
+
+        transcription = media.transcribe_file(audio_filename)
+        if transcription["error"]:
+            return jsonify({"status": "error", "message": transcription["error"]}), 500
+        text = transcription["text"]
+
+        paragraphs = bias.segment_paragraphs(text)
+        # Per-paragraph drama and the overall drama index, from the same batched inference
+        try:
+            drama_result = score_paragraphs(paragraphs, text=text)
+        except Exception:
+            pass
+        paragraphs_json = []
+        reasons = []
+        for para in paragraphs:
+            paragraphs_json.append(para.api_json())
+            if para.is_text_biased_enough and para.reason_biased:
+                reasons.append(para.reason_biased)
+
+        # Calculate drama index as the bias_score
+        try:
+            bias_score = drama_result[0] if isinstance(drama_result, list) else drama_result
+        except Exception:
+            bias_score = None
+
+        try:
+            bias_summary, drama_summary = generate_overall_summary(
+                title="",
+                summary_text=text,
+                bias_score=bias_score,
+                drama_index=(drama_result[0] if isinstance(drama_result, list) else drama_result) if 'drama_result' in locals() else None,
+                reasons=reasons,
+            )
+        except Exception:
+            bias_summary = None
+            drama_summary = None
+
+        return jsonify({
+            "status": "ok",
+            "data": {
+                "text": text,
+                "paragraphs": paragraphs_json,
+                "bias_score": bias_score,
+                "summary": text,
+                "reasons": reasons,
+                "bias_summary": bias_summary,
+                "drama_summary": drama_summary,
+                # Chunk count and any chunks missing from the transcript
+                "transcription": media.transcription_report(transcription),
+            }
+        }), 200
+
+    except Exception as e:
+        print("FETCH VIDEO ERROR:", e)
+        return jsonify({"status": "error", "message": str(e)}), 500
+
+
+@app.route("/jobs/fetch-audio", methods=["POST"])
+def submit_audio_job():
+    """
+    Background version of /fetch-audio: saves the upload and returns a job id to poll.
+    """
+    if "file" not in request.files:
+        return jsonify({"status": "error", "message": "No file provided"}), 400
+
+    file = request.files["file"]
+    if file.filename == "":
+        return jsonify({"status": "error", "message": "No file selected"}), 400
+
+    filename = file.filename
+    save_path = os.path.join(os.path.dirname(__file__), "user_downloads", filename)
+    file.save(save_path)
+
+    job_id = get_job_queue().submit("audio", {"filename": filename})
+    return jsonify({"status": "ok", "job_id": job_id}), 202
+
+@app.route("/jobs/fetch-video", methods=["POST"])
+def submit_video_job():
+    """
+    Background version of /fetch-video: returns a job id to poll.
+    """
+    data = request.get_json()
+    if not data or "url" not in data:
+        return jsonify({"status": "error", "message": "No YouTube URL provided"}), 400
+
+    url = data["url"].strip()
+    if not url:
+        return jsonify({"status": "error", "message": "Empty URL"}), 400
+
+    job_id = get_job_queue().submit("video", {"url": url})
+    return jsonify({"status": "ok", "job_id": job_id}), 202
+
+@app.route("/jobs/<job_id>", methods=["GET"])
+def get_job(job_id):
+    job = get_job_queue().get(job_id)
+    if job is None:
+        return jsonify({"status": "error", "message": "Job not found"}), 404
+    return jsonify({"status": "ok", "job": job}), 200
+
+@app.route("/jobs/<job_id>/events", methods=["GET"])
+def stream_job(job_id):
+    """
+    Streams the job's status whenever its stage changes, until it finishes.
+    Newline-delimited JSON by default; pass ?format=sse for Server-Sent Events.
+    """
+    fmt = request.args.get("format", "ndjson")
+    queue = get_job_queue()
+    if queue.get(job_id) is None:
+        return jsonify({"status": "error", "message": "Job not found"}), 404
+
+    def generate():
+        last_seen = None
+        while True:
+            job = queue.get(job_id)
+            marker = (job["status"], job["stage"], len(job["stages"]))
+            if marker != last_seen:
+                last_seen = marker
+                yield _stream_event("job", job, fmt)
+            if job["status"] in jobs.FINISHED_STATES:
+                return
+            time.sleep(0.5)
+
+    mimetype = "text/event-stream" if fmt == "sse" else "application/x-ndjson"
+    return Response(stream_with_context(generate()), mimetype=mimetype, headers={
+        "Cache-Control": "no-cache",
+        "X-Accel-Buffering": "no",
+    })
+
+@app.route("/search-similar", methods=["POST"])
+def search_similar():
+    data = request.get_json()
+    query = data.get("query")
+    url = data.get("url")
+
+    if not query:
+        return jsonify({
+            "status": "error",
+            "message": "Query not provided"
+        }), 400
+
+    try:
+        if url:
+            articles = scraper.search_urls(query, url)
+        else:
+            articles = scraper.search_urls(query)
+        return jsonify({
+            "status": "ok",
+            "data": articles
+        }), 200
+    except Exception as e:
+        return jsonify({
+            "status": "error",
+            "message": str(e)
+        }), 500
+
+@app.route("/get-drama-index", methods=["POST"])
+def get_drama_index_route():
+    data = request.get_json()
+    text = data.get("text")
+    
+    if not text:
+        return jsonify({
+            "status": "error",
+            "message": "Text not provided"
+        }), 400
+    
+    try:
+        drama_result = get_drama_index(text)
+        if isinstance(drama_result, list):
+            drama_index = [drama_result[0], drama_result[1]]
+        else:
+            drama_index = [drama_result, {}]
+        return jsonify({
+            "status": "success",
+            "drama_index": drama_index
+        }), 200
+    except Exception as e:
+        return jsonify({
+            "status": "error",
+            "message": str(e)
+        }), 500
+    
+@app.route("/convert-yt", methods=["POST"])
+def convert_yt():
+    data = request.get_json()
+    url = data.get("url")
+
+    if not url:
+        return jsonify({
+            "status": "error",
+            "message": "URL not provided"
+        }), 400
+
+    try:
+        audio_filename = download_youtube(url)
+        transcription = media.transcribe_file(audio_filename)
+        
+        if transcription["error"]:
+            return jsonify({
+                "status": "error",
+                "message": transcription["error"]
+            }), 500
+        
+        return jsonify({
+            "status": "ok",
+            "text": transcription["text"],
+            "transcription": media.transcription_report(transcription)
+        }), 200
+    except Exception as e:
+        return jsonify({
+            "status": "error",
+            "message": str(e)
+        }), 500
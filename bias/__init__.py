@@ -9,4 +9,5 @@ from llm_api import Prompt
 # print(response3)
 from .bias_correction import *
 from .bias_detection import *
+from .bias_fused import *
 from .text_replacement import *
\ No newline at end of file
@@ -0,0 +1,177 @@
+from collections import OrderedDict
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+
+# Prompt files whose contents affect a paragraph's analysis; editing any of them invalidates the cache
+PROMPT_FILES = [
+    "bias_detection_prompt.txt",
+    "bias_detection_batch_prompt.txt",
+    "bias_correction_prompt.txt",
+    "bias_fused_prompt.txt",
+]
+
+CACHE_ENABLED = os.getenv("BIAS_CACHE_ENABLED", "1") == "1"
+CACHE_PATH = os.getenv("BIAS_CACHE_PATH", os.path.join(os.path.dirname(__file__), "paragraph_cache.sqlite3"))
+# Entries kept in the in-process LRU tier
+MEMORY_ENTRIES = int(os.getenv("BIAS_CACHE_MEMORY_ENTRIES", "2048"))
+# Total size of cached values allowed in the on-disk tier before the least recently used are evicted
+DISK_MAX_BYTES = int(os.getenv("BIAS_CACHE_MAX_BYTES", str(64 * 1024 * 1024)))
+
+def prompts_hash():
+    """
+    Hash of all prompt files used to analyze a paragraph.
+    """
+    h = hashlib.sha256()
+    for name in PROMPT_FILES:
+        path = os.path.join(os.path.dirname(__file__), name)
+        h.update(name.encode("utf-8"))
+        if os.path.exists(path):
+            with open(path, "rb") as f:
+                h.update(f.read())
+    return h.hexdigest()
+
+def normalize_text(text):
+    """
+    Collapses whitespace so trivially reformatted copies of a paragraph share a cache entry.
+    """
+    return " ".join(text.split())
+
+def text_hash(text):
+    return hashlib.sha256(normalize_text(text).encode("utf-8")).hexdigest()
+
+class AnalysisCache:
+    """
+    Content-addressed cache of paragraph analyses.
+    An in-process LRU tier sits in front of an on-disk SQLite tier.
+    Keys combine the normalized paragraph hash with the prompt files' hash.
+    """
+    def __init__(self, path=CACHE_PATH, memory_entries=MEMORY_ENTRIES, disk_max_bytes=DISK_MAX_BYTES):
+        self.path = path
+        self.memory_entries = memory_entries
+        self.disk_max_bytes = disk_max_bytes
+        self.prompt_hash = prompts_hash()
+        self.hits = 0
+        self.memory_hits = 0
+        self.misses = 0
+        self._memory = OrderedDict()
+        self._lock = threading.Lock()
+        self._conn = None
+        if path:
+            os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+            self._conn = sqlite3.connect(path, check_same_thread=False)
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS analyses ("
+                "key TEXT PRIMARY KEY, prompt_hash TEXT NOT NULL, value TEXT NOT NULL, "
+                "size INTEGER NOT NULL, last_access REAL NOT NULL)"
+            )
+            self._conn.execute("CREATE INDEX IF NOT EXISTS analyses_last_access ON analyses (last_access)")
+            # Entries made with older prompts can never be hit again
+            self._conn.execute("DELETE FROM analyses WHERE prompt_hash != ?", (self.prompt_hash,))
+            self._conn.commit()
+
+    def key(self, text):
+        return f"{self.prompt_hash}:{text_hash(text)}"
+
+    def get(self, text):
+        """
+        Returns the cached analysis dict for text, or None on a miss.
+        """
+        key = self.key(text)
+        with self._lock:
+            if key in self._memory:
+                self._memory.move_to_end(key)
+                self.hits += 1
+                self.memory_hits += 1
+                return dict(self._memory[key])
+
+            row = None
+            if self._conn is not None:
+                row = self._conn.execute("SELECT value FROM analyses WHERE key = ?", (key,)).fetchone()
+            if row is None:
+                self.misses += 1
+                return None
+
+            self._conn.execute("UPDATE analyses SET last_access = ? WHERE key = ?", (time.time(), key))
+            self._conn.commit()
+            value = json.loads(row[0])
+            self._remember(key, value)
+            self.hits += 1
+            return dict(value)
+
+    def set(self, text, value):
+        key = self.key(text)
+        with self._lock:
+            self._remember(key, value)
+            if self._conn is None:
+                return
+            data = json.dumps(value)
+            self._conn.execute(
+                "INSERT OR REPLACE INTO analyses (key, prompt_hash, value, size, last_access) VALUES (?, ?, ?, ?, ?)",
+                (key, self.prompt_hash, data, len(data), time.time())
+            )
+            self._evict()
+            self._conn.commit()
+
+    def _remember(self, key, value):
+        self._memory[key] = dict(value)
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.memory_entries:
+            self._memory.popitem(last=False)
+
+    def _evict(self):
+        # Drop least recently used rows until the disk tier fits in its byte budget
+        total = self._conn.execute("SELECT COALESCE(SUM(size), 0) FROM analyses").fetchone()[0]
+        if total <= self.disk_max_bytes:
+            return
+        freed = 0
+        doomed = []
+        for key, size in self._conn.execute("SELECT key, size FROM analyses ORDER BY last_access"):
+            doomed.append((key,))
+            freed += size
+            if total - freed <= self.disk_max_bytes:
+                break
+        self._conn.executemany("DELETE FROM analyses WHERE key = ?", doomed)
+
+    def clear(self):
+        with self._lock:
+            self._memory.clear()
+            if self._conn is not None:
+                self._conn.execute("DELETE FROM analyses")
+                self._conn.commit()
+
+    def stats(self):
+        with self._lock:
+            disk_entries = disk_bytes = 0
+            if self._conn is not None:
+                disk_entries, disk_bytes = self._conn.execute(
+                    "SELECT COUNT(*), COALESCE(SUM(size), 0) FROM analyses"
+                ).fetchone()
+            lookups = self.hits + self.misses
+            return {
+                "hits": self.hits,
+                "memory_hits": self.memory_hits,
+                "misses": self.misses,
+                "hit_rate": self.hits / lookups if lookups else 0.0,
+                "memory_entries": len(self._memory),
+                "disk_entries": disk_entries,
+                "disk_bytes": disk_bytes,
+            }
+
+_cache = None
+_cache_lock = threading.Lock()
+
+def get_cache():
+    """
+    Returns the shared paragraph analysis cache, or None if caching is disabled.
+    """
+    global _cache
+    if not CACHE_ENABLED:
+        return None
+    with _cache_lock:
+        if _cache is None:
+            _cache = AnalysisCache()
+        return _cache
@@ -0,0 +1,53 @@
+import sys
+import threading
+import time
+import google.generativeai as genai
+from . import analysis_cache
+from .text_replacement import segment_paragraphs
+
+# Compares LLM call counts and latency of the two-call and fused bias pipelines.
+# Usage: python -m bias.benchmark [article.txt]
+
+SAMPLE_TEXT = """
+The economy is collapsing and families are in crisis as radical policies destroy everything.
+The inflation rate increased by 0.3% in the last quarter, according to the Bureau of Labor Statistics.
+Reckless lawmakers once again caved to special interests, ramming through a disastrous bill nobody asked for.
+The city council will meet on Tuesday to discuss the new budget proposal.
+"""
+
+_call_count = 0
+_call_lock = threading.Lock()
+_original_generate_content = genai.GenerativeModel.generate_content
+
+def _counting_generate_content(self, *args, **kwargs):
+    global _call_count
+    with _call_lock:
+        _call_count += 1
+    return _original_generate_content(self, *args, **kwargs)
+
+def run(text, **mode):
+    global _call_count
+    _call_count = 0
+    start = time.perf_counter()
+    paragraphs = segment_paragraphs(text, **mode)
+    elapsed = time.perf_counter() - start
+    biased = sum(1 for p in paragraphs if p.is_text_biased_enough)
+    return _call_count, elapsed, len(paragraphs), biased
+
+if __name__ == "__main__":
+    text = SAMPLE_TEXT
+    if len(sys.argv) > 1:
+        with open(sys.argv[1], "r") as f:
+            text = f.read()
+
+    genai.GenerativeModel.generate_content = _counting_generate_content
+    # Cached paragraphs would make the second mode look free
+    analysis_cache.CACHE_ENABLED = False
+
+    modes = {
+        "two-call": {"batch": False, "fused": False},
+        "fused": {"batch": False, "fused": True},
+    }
+    for name, mode in modes.items():
+        calls, elapsed, total, biased = run(text, **mode)
+        print(f"{name:>9}: {calls} LLM calls, {elapsed:.2f}s for {total} paragraphs ({biased} biased)")
@@ -1,4 +1,4 @@
-from llm_api import Prompt
+from llm_api import generate, generate_async
 import os
 
 # Read the system prompt from file
@@ -8,12 +8,20 @@ with open(prompt_file_path, "r") as f:
 
 def correct_bias(text):
     """
-    Uses the Prompt API to correct bias in the given text.
+    Uses the LLM API to correct bias in the given text.
     Returns the unbiased replacement and the reason it was biased.
     """
-    chat = Prompt(system_message=SYSTEM_PROMPT)
-    response = chat.prompt(text)
+    response = generate(text, system_message=SYSTEM_PROMPT)
+    return _parse_correction_response(response)
 
+async def correct_bias_async(text):
+    """
+    Async version of correct_bias.
+    """
+    response = await generate_async(text, system_message=SYSTEM_PROMPT)
+    return _parse_correction_response(response)
+
+def _parse_correction_response(response):
     # Parse the response (expecting format: unbiased text\nreason)
     lines = response.strip().split('\n', 1)
     unbiased_replacement = lines[0] if len(lines) > 0 else ""
@@ -1,4 +1,6 @@
-from llm_api import Prompt
+from llm_api import generate, generate_async, gather_limited, LLMError
+import asyncio
+import json
 import os
 
 # Read the system prompt from file
@@ -6,14 +8,179 @@ prompt_file_path = os.path.join(os.path.dirname(__file__), "bias_detection_promp
 with open(prompt_file_path, "r") as f:
     SYSTEM_PROMPT = f.read()
 
+batch_prompt_file_path = os.path.join(os.path.dirname(__file__), "bias_detection_batch_prompt.txt")
+with open(batch_prompt_file_path, "r") as f:
+    BATCH_SYSTEM_PROMPT = f.read()
+
+# Approximate input tokens allowed per batched request, and a hard cap on paragraphs per batch
+BATCH_TOKEN_BUDGET = int(os.getenv("BIAS_BATCH_TOKEN_BUDGET", "6000"))
+MAX_BATCH_SIZE = int(os.getenv("BIAS_MAX_BATCH_SIZE", "25"))
+
 def is_text_biased_enough(text):
     """
-    Uses the Prompt API to determine if the given text is biased enough to warrant correction.
+    Uses the LLM API to determine if the given text is biased enough to warrant correction.
     Returns True if biased, False otherwise.
     """
-    chat = Prompt(system_message=SYSTEM_PROMPT)
-    response = chat.prompt(text)
-    
+    response = generate(text, system_message=SYSTEM_PROMPT)
+    return _parse_detection_response(response)
+
+async def is_text_biased_enough_async(text):
+    """
+    Async version of is_text_biased_enough.
+    """
+    response = await generate_async(text, system_message=SYSTEM_PROMPT)
+    return _parse_detection_response(response)
+
+def _parse_detection_response(response):
     # Parse the response (expecting "true" or "false")
-    is_biased = "true" in response.lower()
-    return is_biased
+    return "true" in response.lower()
+
+def estimate_tokens(text):
+    """
+    Rough token estimate (~4 characters per token) used for batch sizing.
+    """
+    return len(text) // 4 + 1
+
+def make_batches(texts, token_budget=None, max_batch_size=None):
+    """
+    Groups paragraph indices into batches that fit within the token budget.
+    A paragraph larger than the whole budget gets a batch of its own.
+    Returns a list of lists of indices into texts.
+    """
+    token_budget = token_budget or BATCH_TOKEN_BUDGET
+    max_batch_size = max_batch_size or MAX_BATCH_SIZE
+
+    batches = []
+    current, current_tokens = [], 0
+    for i, text in enumerate(texts):
+        tokens = estimate_tokens(text)
+        if current and (current_tokens + tokens > token_budget or len(current) >= max_batch_size):
+            batches.append(current)
+            current, current_tokens = [], 0
+        current.append(i)
+        current_tokens += tokens
+    if current:
+        batches.append(current)
+    return batches
+
+def _parse_batch_response(response, count):
+    """
+    Parses the JSON verdict array returned for a batch of count paragraphs.
+    Returns a list of booleans (None for any paragraph without a usable verdict),
+    or None if the response could not be parsed at all.
+    """
+    start, end = response.find("["), response.rfind("]")
+    if start == -1 or end <= start:
+        return None
+    try:
+        items = json.loads(response[start:end + 1])
+    except ValueError:
+        return None
+    if not isinstance(items, list):
+        return None
+
+    verdicts = [None] * count
+    for item in items:
+        if not isinstance(item, dict):
+            continue
+        index, biased = item.get("index"), item.get("biased")
+        if isinstance(biased, str):
+            biased = biased.strip().lower() == "true"
+        if isinstance(index, int) and 0 <= index < count and isinstance(biased, bool):
+            verdicts[index] = biased
+    return verdicts
+
+def _single_verdict(text):
+    try:
+        return is_text_biased_enough(text)
+    except LLMError:
+        return None
+
+def _batch_input(texts):
+    return "\n\n".join(f"[{i}] {text}" for i, text in enumerate(texts))
+
+def _are_batch_texts_biased_enough(texts):
+    """
+    Runs one batched detection request, falling back to single-paragraph
+    calls for any paragraph the model did not give a verdict for.
+    Paragraphs whose detection failed outright get None.
+    """
+    if len(texts) == 1:
+        return [_single_verdict(texts[0])]
+
+    user_input = _batch_input(texts)
+    try:
+        verdicts = _parse_batch_response(generate(user_input, system_message=BATCH_SYSTEM_PROMPT), len(texts))
+    except LLMError:
+        verdicts = None
+    if verdicts is None:
+        verdicts = [None] * len(texts)
+
+    return [_single_verdict(text) if verdict is None else verdict
+            for text, verdict in zip(texts, verdicts)]
+
+async def _single_verdict_async(text):
+    try:
+        return await is_text_biased_enough_async(text)
+    except LLMError:
+        return None
+
+async def _are_batch_texts_biased_enough_async(texts, semaphore):
+    # semaphore bounds every request of the whole call (batches and fallbacks); it is
+    # held per request only, so a batch waiting on its fallbacks doesn't hold a slot
+    if len(texts) == 1:
+        return await gather_limited([_single_verdict_async(texts[0])], semaphore)
+
+    try:
+        async with semaphore:
+            response = await generate_async(_batch_input(texts), system_message=BATCH_SYSTEM_PROMPT)
+        verdicts = _parse_batch_response(response, len(texts))
+    except LLMError:
+        verdicts = None
+    if verdicts is None:
+        verdicts = [None] * len(texts)
+
+    # Fallback calls for the paragraphs without a verdict run concurrently too
+    missing = [i for i, verdict in enumerate(verdicts) if verdict is None]
+    fallbacks = await gather_limited([_single_verdict_async(texts[i]) for i in missing], semaphore)
+    for i, verdict in zip(missing, fallbacks):
+        verdicts[i] = verdict
+    return verdicts
+
+def are_texts_biased_enough(texts, token_budget=None, max_batch_size=None, executor=None):
+    """
+    Batched version of is_text_biased_enough.
+    Sends several paragraphs per request and returns one boolean per text, in order
+    (None where detection failed even after falling back to a single-paragraph call).
+    If an executor is given, batches are sent concurrently through it.
+    """
+    batches = make_batches(texts, token_budget, max_batch_size)
+    batch_texts = [[texts[i] for i in batch] for batch in batches]
+
+    if executor is not None:
+        results = list(executor.map(_are_batch_texts_biased_enough, batch_texts))
+    else:
+        results = [_are_batch_texts_biased_enough(b) for b in batch_texts]
+
+    verdicts = [None] * len(texts)
+    for batch, batch_verdicts in zip(batches, results):
+        for i, verdict in zip(batch, batch_verdicts):
+            verdicts[i] = verdict
+    return verdicts
+
+async def are_texts_biased_enough_async(texts, token_budget=None, max_batch_size=None, limit=8):
+    """
+    Async version of are_texts_biased_enough, with at most limit requests
+    (batches and single-paragraph fallbacks together) in flight.
+    """
+    batches = make_batches(texts, token_budget, max_batch_size)
+    semaphore = asyncio.Semaphore(max(1, limit))
+    results = await asyncio.gather(
+        *(_are_batch_texts_biased_enough_async([texts[i] for i in batch], semaphore) for batch in batches)
+    )
+
+    verdicts = [None] * len(texts)
+    for batch, batch_verdicts in zip(batches, results):
+        for i, verdict in zip(batch, batch_verdicts):
+            verdicts[i] = verdict
+    return verdicts
@@ -0,0 +1,48 @@
+from llm_api import generate, generate_async
+import json
+import os
+
+# Read the system prompt from file
+prompt_file_path = os.path.join(os.path.dirname(__file__), "bias_fused_prompt.txt")
+with open(prompt_file_path, "r") as f:
+    SYSTEM_PROMPT = f.read()
+
+def _parse_fused_response(response):
+    """
+    Parses the JSON object returned by the fused prompt.
+    Returns (is_biased, unbiased_replacement, reason_biased), or None if the response is unusable.
+    """
+    start, end = response.find("{"), response.rfind("}")
+    if start == -1 or end <= start:
+        return None
+    try:
+        data = json.loads(response[start:end + 1])
+    except ValueError:
+        return None
+    if not isinstance(data, dict) or not isinstance(data.get("biased"), bool):
+        return None
+
+    if not data["biased"]:
+        return False, "", ""
+    unbiased_replacement = str(data.get("unbiased_replacement") or "").strip()
+    reason_biased = str(data.get("reason") or "").strip()
+    # A biased verdict without a replacement is as good as a failed parse
+    if not unbiased_replacement:
+        return None
+    return True, unbiased_replacement, reason_biased
+
+def detect_and_correct_bias(text):
+    """
+    Uses a single LLM API call to both detect and correct bias in the given text.
+    Returns (is_biased, unbiased_replacement, reason_biased), or None if the
+    response could not be parsed and the caller should use the two-call path.
+    """
+    response = generate(text, system_message=SYSTEM_PROMPT)
+    return _parse_fused_response(response)
+
+async def detect_and_correct_bias_async(text):
+    """
+    Async version of detect_and_correct_bias.
+    """
+    response = await generate_async(text, system_message=SYSTEM_PROMPT)
+    return _parse_fused_response(response)
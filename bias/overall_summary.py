@@ -1,4 +1,5 @@
-from llm_api import Prompt
+import asyncio
+from llm_api import generate, generate_async
 import os
 
 # Read the system prompt from file
@@ -7,14 +8,7 @@ with open(prompt_file_path, "r") as f:
     SYSTEM_PROMPT = f.read()
 
 
-def generate_bias_summary(title="", summary_text="", bias_score=None, reasons=None):
-    """
-    Generate a concise summary explaining the article's bias.
-    Returns a short string. If the LLM call fails, returns a best-effort fallback string.
-    """
-    reasons = reasons or []
-    chat = Prompt(system_message=SYSTEM_PROMPT)
-
+def _bias_summary_input(title="", summary_text="", bias_score=None, reasons=None):
     # Build a compact input payload for the model
     payload_lines = ["Summarize ONLY the bias aspect:"]
     if title:
@@ -29,10 +23,28 @@ def generate_bias_summary(title="", summary_text="", bias_score=None, reasons=No
         for i, r in enumerate(reasons[:3], 1):
             payload_lines.append(f"Reason{i}: {r}")
 
-    user_input = "\n".join(payload_lines)
+    return "\n".join(payload_lines)
+
+
+def _bias_summary_fallback(bias_score=None, reasons=None):
+    # Fallback: compose from available data
+    if reasons and len(reasons) > 0:
+        return f"Article contains biased language: {reasons[0]}"
+    if bias_score is not None:
+        return f"Bias detected at level {bias_score}/100."
+    return "Bias analysis in progress."
+
+
+def generate_bias_summary(title="", summary_text="", bias_score=None, reasons=None):
+    """
+    Generate a concise summary explaining the article's bias.
+    Returns a short string. If the LLM call fails, returns a best-effort fallback string.
+    """
+    reasons = reasons or []
+    user_input = _bias_summary_input(title, summary_text, bias_score, reasons)
 
     try:
-        response = chat.prompt(user_input)
+        response = generate(user_input, system_message=SYSTEM_PROMPT)
         result = response.strip()
         # Only return if non-empty
         if result:
@@ -40,21 +52,28 @@ def generate_bias_summary(title="", summary_text="", bias_score=None, reasons=No
     except Exception as e:
         pass
     
-    # Fallback: compose from available data
-    if reasons and len(reasons) > 0:
-        return f"Article contains biased language: {reasons[0]}"
-    if bias_score is not None:
-        return f"Bias detected at level {bias_score}/100."
-    return "Bias analysis in progress."
+    return _bias_summary_fallback(bias_score, reasons)
 
 
-def generate_drama_summary(summary_text="", drama_index=None):
+async def generate_bias_summary_async(title="", summary_text="", bias_score=None, reasons=None):
     """
-    Generate a concise summary explaining the article's drama/emotional intensity.
-    Returns a short string. If the LLM call fails, returns a best-effort fallback string.
+    Async version of generate_bias_summary.
     """
-    chat = Prompt(system_message=SYSTEM_PROMPT)
+    reasons = reasons or []
+    user_input = _bias_summary_input(title, summary_text, bias_score, reasons)
+
+    try:
+        response = await generate_async(user_input, system_message=SYSTEM_PROMPT)
+        result = response.strip()
+        if result:
+            return result
+    except Exception as e:
+        pass
+
+    return _bias_summary_fallback(bias_score, reasons)
+
 
+def _drama_summary_input(summary_text="", drama_index=None):
     # Build a compact input payload for the model
     payload_lines = ["Summarize ONLY the drama/emotional intensity aspect:"]
     if summary_text:
@@ -63,17 +82,10 @@ def generate_drama_summary(summary_text="", drama_index=None):
     if drama_index is not None:
         payload_lines.append(f"DramaIndex: {drama_index}")
 
-    user_input = "\n".join(payload_lines)
+    return "\n".join(payload_lines)
 
-    try:
-        response = chat.prompt(user_input)
-        result = response.strip()
-        # Only return if non-empty
-        if result:
-            return result
-    except Exception as e:
-        pass
-    
+
+def _drama_summary_fallback(drama_index=None):
     # Fallback: compose from available data
     if drama_index is not None:
         if drama_index <= 20:
@@ -89,6 +101,42 @@ def generate_drama_summary(summary_text="", drama_index=None):
     return "Drama analysis in progress."
 
 
+def generate_drama_summary(summary_text="", drama_index=None):
+    """
+    Generate a concise summary explaining the article's drama/emotional intensity.
+    Returns a short string. If the LLM call fails, returns a best-effort fallback string.
+    """
+    user_input = _drama_summary_input(summary_text, drama_index)
+
+    try:
+        response = generate(user_input, system_message=SYSTEM_PROMPT)
+        result = response.strip()
+        # Only return if non-empty
+        if result:
+            return result
+    except Exception as e:
+        pass
+    
+    return _drama_summary_fallback(drama_index)
+
+
+async def generate_drama_summary_async(summary_text="", drama_index=None):
+    """
+    Async version of generate_drama_summary.
+    """
+    user_input = _drama_summary_input(summary_text, drama_index)
+
+    try:
+        response = await generate_async(user_input, system_message=SYSTEM_PROMPT)
+        result = response.strip()
+        if result:
+            return result
+    except Exception as e:
+        pass
+
+    return _drama_summary_fallback(drama_index)
+
+
 def generate_overall_summary(title="", summary_text="", bias_score=None, drama_index=None, reasons=None):
     """
     Generate both bias and drama summaries.
@@ -97,3 +145,14 @@ def generate_overall_summary(title="", summary_text="", bias_score=None, drama_i
     bias_summary = generate_bias_summary(title, summary_text, bias_score, reasons)
     drama_summary = generate_drama_summary(summary_text, drama_index)
     return bias_summary, drama_summary
+
+
+async def generate_overall_summary_async(title="", summary_text="", bias_score=None, drama_index=None, reasons=None):
+    """
+    Async version of generate_overall_summary; both summaries are requested concurrently.
+    """
+    bias_summary, drama_summary = await asyncio.gather(
+        generate_bias_summary_async(title, summary_text, bias_score, reasons),
+        generate_drama_summary_async(summary_text, drama_index),
+    )
+    return bias_summary, drama_summary
@@ -1,27 +1,105 @@
-from .bias_detection import is_text_biased_enough
-from .bias_correction import correct_bias
+from concurrent.futures import ThreadPoolExecutor, as_completed
+import os
+from .bias_detection import is_text_biased_enough, is_text_biased_enough_async, are_texts_biased_enough, are_texts_biased_enough_async
+from .bias_correction import correct_bias, correct_bias_async
+from .bias_fused import detect_and_correct_bias, detect_and_correct_bias_async
+from .analysis_cache import get_cache
 import diff
+from llm_api import LLMError, gather_limited
 
-def segment_paragraphs(text):
+# Max number of paragraphs analyzed at once (each one holds an LLM round-trip in flight)
+MAX_WORKERS = int(os.getenv("BIAS_MAX_WORKERS", "8"))
+# Send several paragraphs per detection request instead of one each
+BATCH_DETECTION = os.getenv("BIAS_BATCH_DETECTION", "1") == "1"
+# Detect and correct each paragraph with one fused request instead of two
+FUSED_MODE = os.getenv("BIAS_FUSED_MODE", "0") == "1"
+
+def split_paragraphs(text):
+    """
+    Splits article text into stripped, non-empty paragraph strings.
+    """
+    # Split by newlines to get paragraphs, skipping empty ones
+    return [para_text.strip() for para_text in text.split('\n') if para_text.strip()]
+
+def segment_paragraphs(text, max_workers=None, batch=None, fused=None):
     """
     Segments article text into Paragraph objects, then tests each for bias.
     Splits by newlines (paragraph breaks).
+    Paragraphs are analyzed concurrently with at most max_workers in flight,
+    and are returned in their original order. With batch mode on, detection
+    is done several paragraphs per request before correcting the biased ones.
+    With fused mode on, each paragraph is detected and corrected in one request
+    (batch mode is not used then).
+    Paragraphs already in the analysis cache are not sent to the LLM again.
+    """
+    results = sorted(iter_segment_paragraphs(text, max_workers, batch, fused), key=lambda result: result[0])
+    return [paragraph for _, paragraph in results]
+
+def iter_segment_paragraphs(text, max_workers=None, batch=None, fused=None):
+    """
+    Same analysis as segment_paragraphs, but yields (index, Paragraph) pairs
+    as soon as each paragraph is done, in completion order.
+    Cached paragraphs are yielded first.
     """
-    paragraphs = []
-    
-    # Split by double newlines to get paragraphs
-    raw_paragraphs = text.split('\n')
-    
-    for para_text in raw_paragraphs:
-        # Strip whitespace from each paragraph
-        para_text = para_text.strip()
-        
-        # Skip empty paragraphs
-        if para_text:
-            paragraph = Paragraph(para_text)
-            paragraph.test_for_bias()
-            paragraphs.append(paragraph)
-    
+    paragraphs = [Paragraph(para_text) for para_text in split_paragraphs(text)]
+
+    cache = get_cache()
+    pending = []
+    for i, paragraph in enumerate(paragraphs):
+        if cache is not None and paragraph.load_cached(cache):
+            yield i, paragraph
+        else:
+            pending.append(i)
+    if not pending:
+        return
+
+    batch = BATCH_DETECTION if batch is None else batch
+    fused = FUSED_MODE if fused is None else fused
+    workers = max(1, min(max_workers or MAX_WORKERS, len(pending)))
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        if batch and not fused:
+            verdicts = are_texts_biased_enough([paragraphs[i].text for i in pending], executor=executor)
+            # Paragraphs with a None verdict retry detection on their own
+            futures = {executor.submit(paragraphs[i].analyze, False, verdict): i for i, verdict in zip(pending, verdicts)}
+        else:
+            futures = {executor.submit(paragraphs[i].analyze, fused): i for i in pending}
+
+        for future in as_completed(futures):
+            i = futures[future]
+            future.result()
+            if cache is not None:
+                paragraphs[i].store_cached(cache)
+            yield i, paragraphs[i]
+
+async def segment_paragraphs_async(text, max_concurrency=None, batch=None, fused=None):
+    """
+    Async version of segment_paragraphs.
+    Runs on one event loop with at most max_concurrency LLM requests in flight,
+    instead of one thread per paragraph.
+    """
+    paragraphs = [Paragraph(para_text) for para_text in split_paragraphs(text)]
+    if not paragraphs:
+        return paragraphs
+
+    cache = get_cache()
+    pending = paragraphs
+    if cache is not None:
+        pending = [p for p in paragraphs if not p.load_cached(cache)]
+
+    if pending:
+        batch = BATCH_DETECTION if batch is None else batch
+        fused = FUSED_MODE if fused is None else fused
+        limit = max_concurrency or MAX_WORKERS
+        if batch and not fused:
+            verdicts = await are_texts_biased_enough_async([p.text for p in pending], limit=limit)
+            await gather_limited([p.analyze_async(False, v) for p, v in zip(pending, verdicts)], limit)
+        else:
+            await gather_limited([p.analyze_async(fused) for p in pending], limit)
+
+    if cache is not None:
+        for paragraph in pending:
+            paragraph.store_cached(cache)
+
     return paragraphs
 
 class Paragraph:
@@ -30,17 +108,110 @@ class Paragraph:
         self.is_text_biased_enough = False
         self.unbiased_replacement = ""
         self.reason_biased = ""
+        # Word diff between text and unbiased_replacement, computed once per paragraph
+        self.diff_ops = []
         self.html_diff = ""
-    def test_for_bias(self):
-        if is_text_biased_enough(self.text):
-            self.is_text_biased_enough = True
+        self.analysis_error = ""
+        # Set by metrics.score_paragraphs
+        self.drama_index = None
+        self.emotions = None
+    def compute_diff(self, ops=None):
+        # ops can come from the analysis cache so a hit skips the diff entirely
+        self.diff_ops = ops if ops is not None else diff.diff_ops(self.text, self.unbiased_replacement)
+        self.html_diff = diff.render_html(self.text, self.unbiased_replacement, self.diff_ops)
+    def analyze(self, fused=False, is_biased=None):
+        # Failures stay on this paragraph instead of aborting the whole article
+        try:
+            if fused:
+                self.test_for_bias_fused()
+            else:
+                self.test_for_bias(is_biased)
+        except LLMError as e:
+            self.analysis_error = f"{type(e).__name__}: {e}"
+    def test_for_bias(self, is_biased=None):
+        # is_biased can be passed in when detection was already done (e.g. batched)
+        if is_biased is None:
+            is_biased = is_text_biased_enough(self.text)
+        if is_biased:
+            # Only flag the paragraph once the correction exists, so a failed
+            # correction doesn't render as the whole paragraph deleted
             self.unbiased_replacement, self.reason_biased = correct_bias(self.text)
-            self.html_diff = diff.html_diff(self.text, self.unbiased_replacement)
+            self.is_text_biased_enough = True
+            self.compute_diff()
+    def test_for_bias_fused(self):
+        # One request for detection and correction; fall back to the two-call path on a bad response
+        result = detect_and_correct_bias(self.text)
+        if result is None:
+            self.test_for_bias()
+            return
+        self.is_text_biased_enough, self.unbiased_replacement, self.reason_biased = result
+        if self.is_text_biased_enough:
+            self.compute_diff()
+    async def analyze_async(self, fused=False, is_biased=None):
+        try:
+            if fused:
+                await self.test_for_bias_fused_async()
+            else:
+                await self.test_for_bias_async(is_biased)
+        except LLMError as e:
+            self.analysis_error = f"{type(e).__name__}: {e}"
+    async def test_for_bias_async(self, is_biased=None):
+        if is_biased is None:
+            is_biased = await is_text_biased_enough_async(self.text)
+        if is_biased:
+            self.unbiased_replacement, self.reason_biased = await correct_bias_async(self.text)
+            self.is_text_biased_enough = True
+            self.compute_diff()
+    async def test_for_bias_fused_async(self):
+        result = await detect_and_correct_bias_async(self.text)
+        if result is None:
+            await self.test_for_bias_async()
+            return
+        self.is_text_biased_enough, self.unbiased_replacement, self.reason_biased = result
+        if self.is_text_biased_enough:
+            self.compute_diff()
+    def load_cached(self, cache):
+        cached = cache.get(self.text)
+        if cached is None:
+            return False
+        self.is_text_biased_enough = cached["is_text_biased_enough"]
+        self.unbiased_replacement = cached["unbiased_replacement"]
+        self.reason_biased = cached["reason_biased"]
+        if self.is_text_biased_enough:
+            self.compute_diff(cached.get("diff_ops"))
+        return True
+    def store_cached(self, cache):
+        # Don't persist analyses that failed part-way
+        if self.analysis_error:
+            return
+        cache.set(self.text, {
+            "is_text_biased_enough": self.is_text_biased_enough,
+            "unbiased_replacement": self.unbiased_replacement,
+            "reason_biased": self.reason_biased,
+            "diff_ops": self.diff_ops
+        })
     def json(self):
         return {
             "text": self.text,
             "is_text_biased_enough": self.is_text_biased_enough,
             "unbiased_replacement": self.unbiased_replacement,
             "reason_biased": self.reason_biased,
-            "html_diff": self.html_diff
-        }
\ No newline at end of file
+            "html_diff": self.html_diff,
+            "diff_ops": self.diff_ops,
+            "analysis_error": self.analysis_error,
+            "drama_index": self.drama_index,
+            "emotions": self.emotions
+        }
+    def api_json(self):
+        # Paragraph shape used by the /fetch-url and /fetch-video responses
+        return {
+            "text": self.text,
+            "bias_score": self.is_text_biased_enough,
+            "unbiased_replacement": self.unbiased_replacement,
+            "reason_biased": self.reason_biased,
+            "differences": self.html_diff,
+            "diff_ops": self.diff_ops,
+            "analysis_error": self.analysis_error,
+            "drama_index": self.drama_index,
+            "emotions": self.emotions
+        }
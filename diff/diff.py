@@ -1,28 +1,72 @@
 import difflib
+import re
 
-def html_diff(original, edited):
-    orig_words = original.split()
-    edit_words = edited.split()
-    
-    matcher = difflib.SequenceMatcher(None, orig_words, edit_words)
-    output = []
+# Word-level diffs between a paragraph and its rewrite.
+# diff_ops() returns compact opcodes with character offsets into both texts:
+#   [tag, a_start, a_end, b_start, b_end]
+# with tag "=" (equal), "-" (delete), "+" (insert) or "~" (replace).
+# Words are matched with difflib's SequenceMatcher, which stays fast even when
+# an LLM rewrite changes most of a paragraph. render_html() turns opcodes into
+# the marked-up string the API has always returned; html_diff() does both in one call.
+
+_TOKEN = re.compile(r"\S+")
+
+def tokenize(text):
+    """
+    Whitespace-separated words of text as (word, start, end) triples.
+    """
+    return [(m.group(), m.start(), m.end()) for m in _TOKEN.finditer(text)]
+
+_TAGS = {"equal": "=", "delete": "-", "insert": "+", "replace": "~"}
 
-    for tag, i1, i2, j1, j2 in matcher.get_opcodes():
-        if tag == 'equal':
-            output.append(" ".join(edit_words[j1:j2]))
-        elif tag == 'insert':
-            output.append(f"<span class='inserted'>{' '.join(edit_words[j1:j2])}</span>")
-        elif tag == 'replace':
-            removed = f"<span class='deleted'>{' '.join(orig_words[i1:i2])}</span>"
-            added = f"<span class='inserted'>{' '.join(edit_words[j1:j2])}</span>"
-            output.append(f"{removed} {added}")
-        elif tag == 'delete':
-            output.append(f"<span class='deleted'>{' '.join(orig_words[i1:i2])}</span>")
+def _word_opcodes(a, b):
+    """
+    Word-index opcodes [tag, i1, i2, j1, j2] for word lists a and b.
+    """
+    matcher = difflib.SequenceMatcher(None, a, b)
+    return [[_TAGS[tag], i1, i2, j1, j2] for tag, i1, i2, j1, j2 in matcher.get_opcodes()]
 
+def _span(tokens, start, end, text_length):
+    if start == end:
+        offset = tokens[start][1] if start < len(tokens) else text_length
+        return offset, offset
+    return tokens[start][1], tokens[end - 1][2]
+
+def diff_ops(original, edited):
+    """
+    Compact opcodes [tag, a_start, a_end, b_start, b_end] (character offsets)
+    turning original into edited word by word.
+    """
+    a_tokens, b_tokens = tokenize(original), tokenize(edited)
+    ops = []
+    for tag, i1, i2, j1, j2 in _word_opcodes([t[0] for t in a_tokens], [t[0] for t in b_tokens]):
+        ops.append([tag, *_span(a_tokens, i1, i2, len(original)), *_span(b_tokens, j1, j2, len(edited))])
+    return ops
+
+def render_html(original, edited, ops):
+    """
+    Renders opcodes as text with <span class='deleted'> / <span class='inserted'> markup.
+    """
+    output = []
+    for tag, a1, a2, b1, b2 in ops:
+        removed = " ".join(original[a1:a2].split())
+        added = " ".join(edited[b1:b2].split())
+        if tag == "=":
+            output.append(added)
+        elif tag == "+":
+            output.append(f"<span class='inserted'>{added}</span>")
+        elif tag == "~":
+            output.append(f"<span class='deleted'>{removed}</span> <span class='inserted'>{added}</span>")
+        elif tag == "-":
+            output.append(f"<span class='deleted'>{removed}</span>")
     return " ".join(output)
 
+def html_diff(original, edited):
+    return render_html(original, edited, diff_ops(original, edited))
+
 if __name__ == "__main__":
     old_text = "The dog sat on the mat."
     new_text = "The big dog sat on the red rug."
 
-    print(html_diff(old_text, new_text))
\ No newline at end of file
+    print(diff_ops(old_text, new_text))
+    print(html_diff(old_text, new_text))
@@ -0,0 +1,4 @@
+from .queue import JobQueue, QUEUED, RUNNING, DONE, FAILED, FINISHED_STATES
+from .media_jobs import HANDLERS, analyze_transcript
+
+__all__ = ["JobQueue", "QUEUED", "RUNNING", "DONE", "FAILED", "FINISHED_STATES", "HANDLERS", "analyze_transcript"]
@@ -0,0 +1,84 @@
+import bias
+import media
+from metrics import score_paragraphs
+from bias.overall_summary import generate_overall_summary
+
+# Background versions of /fetch-audio and /fetch-video, run by the JobQueue.
+# Each handler takes the job payload and a report(stage, **details) callback.
+
+def analyze_transcript(transcription, report, paragraph_json):
+    """
+    Runs the bias, drama and summary analysis on a transcript (media.transcribe_file's result).
+    Returns the same data dict as the synchronous media endpoints.
+    """
+    text = transcription["text"]
+    report("analyze")
+    paragraphs = bias.segment_paragraphs(text)
+
+    report("score", paragraphs=len(paragraphs))
+    # Per-paragraph drama and the overall drama index, from the same batched inference
+    try:
+        drama_result = score_paragraphs(paragraphs, text=text)
+        bias_score = drama_result[0]
+    except Exception:
+        bias_score = None
+
+    paragraphs_json = []
+    reasons = []
+    for para in paragraphs:
+        paragraphs_json.append(paragraph_json(para))
+        if para.is_text_biased_enough and para.reason_biased:
+            reasons.append(para.reason_biased)
+
+    report("summarize")
+    try:
+        bias_summary, drama_summary = generate_overall_summary(
+            title="",
+            summary_text=text,
+            bias_score=bias_score,
+            drama_index=bias_score,
+            reasons=reasons,
+        )
+    except Exception:
+        bias_summary = None
+        drama_summary = None
+
+    return {
+        "text": text,
+        "paragraphs": paragraphs_json,
+        "bias_score": bias_score,
+        "summary": text,
+        "reasons": reasons,
+        "bias_summary": bias_summary,
+        "drama_summary": drama_summary,
+        # Chunk count and any chunks missing from the transcript
+        "transcription": media.transcription_report(transcription),
+    }
+
+def _transcribe(filename, report):
+    report("transcribe", filename=filename)
+    transcription = media.transcribe_file(filename)
+    if transcription["error"]:
+        raise RuntimeError(transcription["error"])
+    return transcription
+
+def run_audio_job(payload, report):
+    """
+    payload: {"filename": name of an uploaded file in user_downloads}
+    """
+    transcription = _transcribe(payload["filename"], report)
+    return analyze_transcript(transcription, report, bias.Paragraph.json)
+
+def run_video_job(payload, report):
+    """
+    payload: {"url": YouTube URL}
+    """
+    report("download", url=payload["url"])
+    audio_filename = media.download_youtube(payload["url"])
+    transcription = _transcribe(audio_filename, report)
+    return analyze_transcript(transcription, report, bias.Paragraph.api_json)
+
+HANDLERS = {
+    "audio": run_audio_job,
+    "video": run_video_job,
+}
@@ -0,0 +1,190 @@
+import json
+import os
+import socket
+import sqlite3
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+
+JOBS_DB_PATH = os.getenv("JOBS_DB_PATH", os.path.join(os.path.dirname(__file__), "jobs.sqlite3"))
+# Media jobs allowed to run at once, so long videos can't starve article analysis
+MAX_MEDIA_JOBS = int(os.getenv("MAX_MEDIA_JOBS", "2"))
+# A running job is leased to the process running it and the lease is renewed every
+# JOBS_LEASE_SECONDS / 3; another process only takes the job over once the lease expires
+LEASE_SECONDS = float(os.getenv("JOBS_LEASE_SECONDS", "60"))
+
+QUEUED = "queued"
+RUNNING = "running"
+DONE = "done"
+FAILED = "failed"
+FINISHED_STATES = {DONE, FAILED}
+
+class JobQueue:
+    """
+    Persistent background job queue.
+    Job state lives in SQLite, so queued jobs (and jobs interrupted mid-run)
+    are picked up again after a restart. A bounded thread pool runs them.
+    Several processes can share one database: a job is claimed atomically and
+    leased to its owner, and only jobs whose lease expired are taken over.
+    handlers maps a job kind to a function(payload, report) returning a JSON-able
+    result; report(stage, **details) records per-stage progress.
+    """
+    def __init__(self, handlers, path=JOBS_DB_PATH, max_workers=MAX_MEDIA_JOBS, lease=LEASE_SECONDS):
+        self.handlers = handlers
+        self.path = path
+        self.lease = lease
+        self.owner = f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:8]}"
+        self._lock = threading.Lock()
+        self._running = set()
+        # Submitted to our executor and not finished (or skipped) yet
+        self._submitted = set()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS jobs ("
+            "id TEXT PRIMARY KEY, kind TEXT NOT NULL, payload TEXT NOT NULL, status TEXT NOT NULL, "
+            "stage TEXT, stages TEXT NOT NULL, result TEXT, error TEXT, "
+            "created_at REAL NOT NULL, updated_at REAL NOT NULL, owner TEXT, lease_until REAL)"
+        )
+        # Databases created before leases existed
+        columns = {row[1] for row in self._conn.execute("PRAGMA table_info(jobs)")}
+        for column, kind in (("owner", "TEXT"), ("lease_until", "REAL")):
+            if column not in columns:
+                self._conn.execute(f"ALTER TABLE jobs ADD COLUMN {column} {kind}")
+        self._conn.commit()
+        self._executor = ThreadPoolExecutor(max_workers=max(1, max_workers), thread_name_prefix="media-job")
+        self._resume(include_queued=True)
+        self._stopped = threading.Event()
+        self._heartbeat = threading.Thread(target=self._heartbeat_loop, name="media-job-lease", daemon=True)
+        self._heartbeat.start()
+
+    def _resume(self, include_queued=False):
+        # Jobs whose owner stopped renewing its lease run again from the start. At startup,
+        # queued jobs are submitted too; if another live process already has them, the
+        # claim in _run lets only one of us run each.
+        statuses = "status = ? OR " if include_queued else ""
+        params = (QUEUED,) if include_queued else ()
+        with self._lock:
+            rows = self._conn.execute(
+                f"SELECT id FROM jobs WHERE {statuses}(status = ? AND (lease_until IS NULL OR lease_until < ?)) "
+                "ORDER BY created_at", (*params, RUNNING, time.time())
+            ).fetchall()
+        for (job_id,) in rows:
+            self._submit(job_id)
+
+    def _submit(self, job_id):
+        with self._lock:
+            if job_id in self._submitted:
+                return
+            self._submitted.add(job_id)
+        self._executor.submit(self._run, job_id)
+
+    def _heartbeat_loop(self):
+        while not self._stopped.wait(self.lease / 3):
+            with self._lock:
+                running = list(self._running)
+                self._conn.executemany(
+                    "UPDATE jobs SET lease_until = ? WHERE id = ? AND owner = ?",
+                    [(time.time() + self.lease, job_id, self.owner) for job_id in running]
+                )
+                self._conn.commit()
+            # Take over jobs left behind by processes that died while running them
+            self._resume()
+
+    def _claim(self, job_id):
+        # Atomic: only one process moves a job to running, and only if it is queued or its lease expired
+        now = time.time()
+        with self._lock:
+            claimed = self._conn.execute(
+                "UPDATE jobs SET status = ?, stage = NULL, stages = ?, owner = ?, lease_until = ?, updated_at = ? "
+                "WHERE id = ? AND (status = ? OR (status = ? AND (lease_until IS NULL OR lease_until < ?)))",
+                (RUNNING, "[]", self.owner, now + self.lease, now, job_id, QUEUED, RUNNING, now)
+            ).rowcount == 1
+            self._conn.commit()
+            if claimed:
+                self._running.add(job_id)
+        return claimed
+
+    def submit(self, kind, payload):
+        if kind not in self.handlers:
+            raise ValueError(f"Unknown job kind: {kind}")
+        job_id = uuid.uuid4().hex
+        now = time.time()
+        with self._lock:
+            self._conn.execute(
+                "INSERT INTO jobs (id, kind, payload, status, stages, created_at, updated_at) VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (job_id, kind, json.dumps(payload), QUEUED, "[]", now, now)
+            )
+            self._conn.commit()
+        self._submit(job_id)
+        return job_id
+
+    def get(self, job_id):
+        """
+        Returns the job's status dict, or None if there is no such job.
+        """
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT id, kind, status, stage, stages, result, error, created_at, updated_at FROM jobs WHERE id = ?",
+                (job_id,)
+            ).fetchone()
+        if row is None:
+            return None
+        job_id, kind, status, stage, stages, result, error, created_at, updated_at = row
+        return {
+            "id": job_id,
+            "kind": kind,
+            "status": status,
+            "stage": stage,
+            "stages": json.loads(stages),
+            "result": json.loads(result) if result else None,
+            "error": error,
+            "created_at": created_at,
+            "updated_at": updated_at,
+        }
+
+    def _update(self, job_id, **fields):
+        # Only while we still own the job; a process that lost its lease must not overwrite the new owner
+        fields["updated_at"] = time.time()
+        columns = ", ".join(f"{name} = ?" for name in fields)
+        with self._lock:
+            self._conn.execute(
+                f"UPDATE jobs SET {columns} WHERE id = ? AND owner = ?", (*fields.values(), job_id, self.owner)
+            )
+            self._conn.commit()
+
+    def _run(self, job_id):
+        try:
+            self._run_claimed(job_id)
+        finally:
+            with self._lock:
+                self._submitted.discard(job_id)
+                self._running.discard(job_id)
+
+    def _run_claimed(self, job_id):
+        with self._lock:
+            row = self._conn.execute("SELECT kind, payload FROM jobs WHERE id = ?", (job_id,)).fetchone()
+        if row is None:
+            return
+        kind, payload = row[0], json.loads(row[1])
+        if not self._claim(job_id):
+            return
+        stages = []
+
+        def report(stage, **details):
+            stages.append(dict(details, stage=stage, at=time.time()))
+            self._update(job_id, stage=stage, stages=json.dumps(stages))
+
+        try:
+            result = self.handlers[kind](payload, report)
+        except Exception as e:
+            print(f"JOB {job_id} ({kind}) FAILED:", e)
+            self._update(job_id, status=FAILED, error=str(e), lease_until=None)
+            return
+        self._update(job_id, status=DONE, result=json.dumps(result), lease_until=None)
+
+    def shutdown(self, wait=True):
+        self._stopped.set()
+        self._heartbeat.join()
+        self._executor.shutdown(wait=wait)
+        self._conn.close()
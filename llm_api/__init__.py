@@ -1,3 +1,7 @@
-from .prompt import Prompt
+from .prompt import Prompt, generate, generate_async, generate_many_async, gather_limited, get_model
+from .errors import LLMError, LLMRequestError, LLMRetryableError, LLMRateLimitError, CircuitOpenError
 
-__all__ = ["Prompt"]
\ No newline at end of file
+__all__ = [
+    "Prompt", "generate", "generate_async", "generate_many_async", "gather_limited", "get_model",
+    "LLMError", "LLMRequestError", "LLMRetryableError", "LLMRateLimitError", "CircuitOpenError",
+]
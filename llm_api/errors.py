@@ -0,0 +1,24 @@
+class LLMError(Exception):
+    """
+    Base class for failed LLM calls.
+    """
+
+class LLMRequestError(LLMError):
+    """
+    The request was rejected and retrying it will not help (bad input, auth, blocked content).
+    """
+
+class LLMRetryableError(LLMError):
+    """
+    A transient upstream failure (timeouts, 5xx) that persisted through every retry.
+    """
+
+class LLMRateLimitError(LLMRetryableError):
+    """
+    The upstream quota was exhausted (HTTP 429) through every retry.
+    """
+
+class CircuitOpenError(LLMError):
+    """
+    The circuit breaker is open because the upstream is unhealthy; the call was not attempted.
+    """
@@ -0,0 +1,113 @@
+import json
+import re
+import sys
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+# Minimal local stand-in for the Gemini REST API (generateContent only), for exercising
+# llm_api's rate limiting, retries and circuit breaker without touching the real service.
+# Point the client at it with GEMINI_API_ENDPOINT=http://127.0.0.1:<port>.
+# Usage: python llm_api/fake_server.py [port]
+
+GENERATE_PATH = re.compile(r"^/v1beta/models/(?P<model>[^/:]+):generateContent")
+
+STATUS_NAMES = {
+    400: "INVALID_ARGUMENT",
+    429: "RESOURCE_EXHAUSTED",
+    500: "INTERNAL",
+    503: "UNAVAILABLE",
+}
+
+def default_responder(system_instruction, user_text):
+    return "false"
+
+class FakeLLMServer:
+    """
+    Threaded HTTP server answering generateContent requests with responder(system_instruction, user_text).
+    Failures can be queued with fail_next() to simulate quota bursts or outages.
+    """
+    def __init__(self, port=0, responder=default_responder):
+        self.responder = responder
+        self.requests = []
+        self._failures = []
+        self._lock = threading.Lock()
+        self.httpd = ThreadingHTTPServer(("127.0.0.1", port), self._handler())
+        self._thread = None
+
+    @property
+    def endpoint(self):
+        host, port = self.httpd.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def fail_next(self, count=1, status=429):
+        with self._lock:
+            self._failures.extend([status] * count)
+
+    def start(self):
+        self._thread = threading.Thread(target=self.httpd.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+    def _next_failure(self):
+        with self._lock:
+            return self._failures.pop(0) if self._failures else None
+
+    def _handler(self):
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def _send(self, status, body):
+                data = json.dumps(body).encode("utf-8")
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(data)))
+                self.end_headers()
+                self.wfile.write(data)
+
+            def do_POST(self):
+                length = int(self.headers.get("Content-Length") or 0)
+                payload = json.loads(self.rfile.read(length) or b"{}")
+                match = GENERATE_PATH.match(self.path)
+                if not match:
+                    self._send(404, {"error": {"code": 404, "message": "Not found", "status": "NOT_FOUND"}})
+                    return
+
+                with server._lock:
+                    server.requests.append(payload)
+                failure = server._next_failure()
+                if failure is not None:
+                    self._send(failure, {"error": {
+                        "code": failure,
+                        "message": "Injected failure",
+                        "status": STATUS_NAMES.get(failure, "UNKNOWN"),
+                    }})
+                    return
+
+                system = payload.get("systemInstruction") or payload.get("system_instruction") or {}
+                system_text = "".join(part.get("text", "") for part in system.get("parts", []))
+                contents = payload.get("contents") or [{}]
+                user_text = "".join(part.get("text", "") for part in contents[-1].get("parts", []))
+                text = server.responder(system_text, user_text)
+                self._send(200, {
+                    "candidates": [{
+                        "content": {"parts": [{"text": text}], "role": "model"},
+                        "finishReason": "STOP",
+                        "index": 0,
+                    }],
+                    "modelVersion": match.group("model"),
+                })
+
+            def log_message(self, format, *args):
+                pass
+
+        return Handler
+
+if __name__ == "__main__":
+    port = int(sys.argv[1]) if len(sys.argv) > 1 else 8765
+    fake = FakeLLMServer(port)
+    print(f"Fake Gemini API listening on {fake.endpoint}")
+    fake.httpd.serve_forever()
@@ -1,6 +1,10 @@
+import asyncio
+import contextlib
 import google.generativeai as genai
 from dotenv import load_dotenv
 import os
+import threading
+from .resilience import ResilientCaller, estimate_tokens
 
 print("finished importing gemini")
 
@@ -10,45 +14,173 @@ GEMINI_KEY = os.getenv("GEMINI_API_KEY")
 if GEMINI_KEY is None:
     raise ValueError("GEMINI_KEY is not set in the environment!")
 print(f"Gemini key: {GEMINI_KEY[:5]}")
-genai.configure(api_key=GEMINI_KEY)
+# Optional endpoint override, e.g. http://127.0.0.1:8765 for llm_api/fake_server.py
+GEMINI_API_ENDPOINT = os.getenv("GEMINI_API_ENDPOINT")
+if GEMINI_API_ENDPOINT:
+    genai.configure(api_key=GEMINI_KEY, transport="rest", client_options={"api_endpoint": GEMINI_API_ENDPOINT})
+else:
+    genai.configure(api_key=GEMINI_KEY)
+
+DEFAULT_MODEL = "gemini-2.0-flash"
+
+# Shared model objects, one per (model name, system instruction)
+_models = {}
+_models_lock = threading.Lock()
+
+# Rate limiter, retries and circuit breaker shared by every call in the process
+caller = ResilientCaller()
+
+def get_model(system_message=None, model_name=DEFAULT_MODEL):
+    """
+    Returns the shared GenerativeModel for this model name and system instruction,
+    creating it on first use. Model objects hold no conversation state, so they
+    are safe to share between threads.
+    """
+    key = (model_name, system_message or None)
+    model = _models.get(key)
+    if model is None:
+        with _models_lock:
+            model = _models.get(key)
+            if model is None:
+                model = genai.GenerativeModel(
+                    model_name,
+                    system_instruction=system_message if system_message else None
+                )
+                _models[key] = model
+    return model
+
+def generate(user_input, system_message=None, model_name=DEFAULT_MODEL):
+    """
+    Stateless single-shot generation: no history is kept or sent.
+    Safe to call from many threads at once.
+    Raises an llm_api.errors.LLMError subclass if the call fails.
+    """
+    model = get_model(system_message, model_name)
+    tokens = estimate_tokens(user_input) + estimate_tokens(system_message or "")
+    return caller.call(lambda: model.generate_content(user_input).text, tokens=tokens)
+
+async def generate_async(user_input, system_message=None, model_name=DEFAULT_MODEL):
+    """
+    Async version of generate(), built on the SDK's async generation API.
+    Many calls can be awaited concurrently from one event loop without a thread each.
+    """
+    model = get_model(system_message, model_name)
+    tokens = estimate_tokens(user_input) + estimate_tokens(system_message or "")
+
+    async def send():
+        response = await model.generate_content_async(user_input)
+        return response.text
+
+    return await caller.call_async(send, tokens=tokens)
+
+async def gather_limited(coros, limit):
+    """
+    Awaits the given coroutines with at most limit running at once.
+    limit can also be an asyncio.Semaphore shared with other gather_limited calls,
+    so nested fan-outs stay under one bound.
+    Returns their results in input order; the first exception is raised.
+    """
+    semaphore = limit if isinstance(limit, asyncio.Semaphore) else asyncio.Semaphore(max(1, limit))
+
+    async def run(coro):
+        async with semaphore:
+            return await coro
+
+    return await asyncio.gather(*(run(coro) for coro in coros))
+
+async def generate_many_async(user_inputs, system_message=None, model_name=DEFAULT_MODEL, limit=32):
+    """
+    Runs generate_async() over many inputs with bounded concurrency, preserving order.
+    """
+    return await gather_limited(
+        [generate_async(user_input, system_message, model_name) for user_input in user_inputs],
+        limit
+    )
 
 class Prompt:
-    def __init__(self, system_message=None):
+    def __init__(self, system_message=None, model_name=DEFAULT_MODEL):
         self.messages = []
         self.system_message = system_message
-        self.model = genai.GenerativeModel(
-            "gemini-2.0-flash",
-            system_instruction=system_message if system_message else None
-        )
+        self.model_name = model_name
+        self.model = get_model(system_message, model_name)
+        self._chat = None
+        # Guards self._chat and self.messages for prompt() and prompt_async() alike
+        self._lock = threading.Lock()
+
+    def generate(self, user_input):
+        """
+        Single-shot request with this prompt's system message; does not touch the history.
+        """
+        return generate(user_input, self.system_message, self.model_name)
+
+    async def generate_async(self, user_input):
+        return await generate_async(user_input, self.system_message, self.model_name)
+
+    def _history(self):
+        return [{"role": msg["role"], "parts": [msg["content"]]} for msg in self.messages]
     
     def prompt(self, user_input):
+        # One chat session per conversation: the session keeps its own history,
+        # so each turn only sends the new message instead of rebuilding everything
+        # Raises an llm_api.errors.LLMError subclass if the call fails
+        with self._lock:
+            if self._chat is None:
+                self._chat = self.model.start_chat(history=self._history())
+            tokens = sum(estimate_tokens(msg["content"]) for msg in self.messages) + estimate_tokens(user_input)
+
+            def send():
+                try:
+                    return self._chat.send_message(user_input).text
+                except Exception:
+                    # Rebuild the session from self.messages, without the failed turn, before retrying
+                    self._chat = self.model.start_chat(history=self._history())
+                    raise
+
+            assistant_message = caller.call(send, tokens=tokens)
+            self.messages.append({"role": "user", "content": user_input})
+            self.messages.append({"role": "model", "content": assistant_message})
+
+            return assistant_message
+
+    @contextlib.asynccontextmanager
+    async def _locked_async(self):
+        # Takes the same lock as prompt() without blocking the event loop; polling
+        # (rather than acquiring in a thread) leaves nothing holding it if we're cancelled
+        while not self._lock.acquire(blocking=False):
+            await asyncio.sleep(0.01)
         try:
+            yield
+        finally:
+            self._lock.release()
+
+    async def prompt_async(self, user_input):
+        """
+        Async version of prompt(); turns of one conversation are still sent one at a
+        time, including when prompt() and prompt_async() are mixed on one Prompt.
+        """
+        async with self._locked_async():
+            if self._chat is None:
+                self._chat = self.model.start_chat(history=self._history())
+            tokens = sum(estimate_tokens(msg["content"]) for msg in self.messages) + estimate_tokens(user_input)
+
+            async def send():
+                try:
+                    response = await self._chat.send_message_async(user_input)
+                    return response.text
+                except Exception:
+                    self._chat = self.model.start_chat(history=self._history())
+                    raise
+
+            assistant_message = await caller.call_async(send, tokens=tokens)
             self.messages.append({"role": "user", "content": user_input})
-            
-            # Build conversation history for Gemini
-            history = []
-            for msg in self.messages:
-                history.append({
-                    "role": msg["role"],
-                    "parts": [msg["content"]]
-                })
-            
-            # Create chat session with history
-            chat = self.model.start_chat(history=history[:-1] if history else [])
-            response = chat.send_message(user_input)
-            
-            assistant_message = response.text
             self.messages.append({"role": "model", "content": assistant_message})
 
             return assistant_message
-        except Exception as e:
-            return f"Error: {str(e)}"
     
     def clear_history(self):
-        if self.messages and self.messages[0]["role"] == "system":
-            self.messages = [self.messages[0]]
-        else:
+        with self._lock:
             self.messages = []
+            self._chat = None
 
 if __name__ == "__main__":
     chat = Prompt()
@@ -57,4 +189,4 @@ if __name__ == "__main__":
     response2 = chat.prompt("What is 3 plus the answer to the previous question?")
     print(response2)
     response3 = chat.prompt("What is 5 times the answer to the previous question, plus the answer to the previous previous question?")
-    print(response3)
\ No newline at end of file
+    print(response3)
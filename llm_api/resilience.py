@@ -0,0 +1,223 @@
+import asyncio
+import os
+import random
+import threading
+import time
+from .errors import LLMError, LLMRequestError, LLMRetryableError, LLMRateLimitError, CircuitOpenError
+
+# Client-side quota; keep these at or below the project's Gemini limits
+REQUESTS_PER_MINUTE = float(os.getenv("GEMINI_REQUESTS_PER_MINUTE", "1000"))
+TOKENS_PER_MINUTE = float(os.getenv("GEMINI_TOKENS_PER_MINUTE", "4000000"))
+# Retries after the first attempt, with jittered exponential backoff between them
+MAX_RETRIES = int(os.getenv("GEMINI_MAX_RETRIES", "4"))
+BACKOFF_BASE = float(os.getenv("GEMINI_BACKOFF_BASE", "0.5"))
+BACKOFF_MAX = float(os.getenv("GEMINI_BACKOFF_MAX", "20"))
+# Consecutive failed calls before the breaker opens, and how long it stays open
+BREAKER_THRESHOLD = int(os.getenv("GEMINI_BREAKER_THRESHOLD", "5"))
+BREAKER_COOLDOWN = float(os.getenv("GEMINI_BREAKER_COOLDOWN", "30"))
+
+RETRYABLE_STATUS_CODES = {408, 429, 500, 502, 503, 504}
+RATE_LIMIT_NAMES = {"ResourceExhausted", "TooManyRequests"}
+RETRYABLE_NAMES = RATE_LIMIT_NAMES | {
+    "ServiceUnavailable", "InternalServerError", "DeadlineExceeded", "GatewayTimeout",
+    "BadGateway", "Aborted", "RetryError", "Timeout", "ReadTimeout", "ConnectTimeout",
+}
+
+def estimate_tokens(text):
+    """
+    Rough token estimate (~4 characters per token), used for the tokens/min budget.
+    """
+    return len(text) // 4 + 1
+
+class TokenBucket:
+    """
+    Continuously refilling token bucket holding up to one minute of budget.
+    """
+    def __init__(self, per_minute):
+        self.capacity = max(1.0, per_minute)
+        self.rate = self.capacity / 60.0
+        self.tokens = self.capacity
+        self.updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def _refill(self, now):
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+    def reserve(self, amount):
+        """
+        Takes amount tokens (going into debt if needed) and returns how long
+        the caller must wait before the reservation is covered.
+        """
+        amount = min(amount, self.capacity)
+        with self._lock:
+            self._refill(time.monotonic())
+            self.tokens -= amount
+            if self.tokens >= 0:
+                return 0.0
+            return -self.tokens / self.rate
+
+class RateLimiter:
+    """
+    Blocks callers so requests/min and tokens/min stay within budget.
+    """
+    def __init__(self, requests_per_minute=REQUESTS_PER_MINUTE, tokens_per_minute=TOKENS_PER_MINUTE):
+        self.requests = TokenBucket(requests_per_minute)
+        self.tokens = TokenBucket(tokens_per_minute)
+
+    def acquire(self, tokens=1):
+        wait = max(self.requests.reserve(1), self.tokens.reserve(tokens))
+        if wait > 0:
+            time.sleep(wait)
+
+    async def acquire_async(self, tokens=1):
+        wait = max(self.requests.reserve(1), self.tokens.reserve(tokens))
+        if wait > 0:
+            await asyncio.sleep(wait)
+
+class CircuitBreaker:
+    """
+    Opens after threshold consecutive failures and fails fast for cooldown seconds.
+    After the cooldown a single probe call is let through (half-open);
+    its outcome closes the breaker again or restarts the cooldown.
+    """
+    def __init__(self, threshold=BREAKER_THRESHOLD, cooldown=BREAKER_COOLDOWN):
+        self.threshold = threshold
+        self.cooldown = cooldown
+        self.failures = 0
+        self.opened_at = None
+        self._probing = False
+        self._lock = threading.Lock()
+
+    @property
+    def state(self):
+        with self._lock:
+            if self.opened_at is None:
+                return "closed"
+            if time.monotonic() - self.opened_at >= self.cooldown:
+                return "half-open"
+            return "open"
+
+    def before_call(self):
+        """
+        Raises CircuitOpenError while open. Returns True when this call is the
+        half-open probe; the caller must then record an outcome or release_probe().
+        """
+        with self._lock:
+            if self.opened_at is None:
+                return False
+            remaining = self.cooldown - (time.monotonic() - self.opened_at)
+            if remaining > 0 or self._probing:
+                raise CircuitOpenError(f"LLM upstream unhealthy, retry in {max(0.0, remaining):.1f}s")
+            self._probing = True
+            return True
+
+    def release_probe(self):
+        # The probe ended without a verdict (cancelled, interrupted, ...); let the next call probe
+        with self._lock:
+            self._probing = False
+
+    def record_success(self):
+        with self._lock:
+            self.failures = 0
+            self.opened_at = None
+            self._probing = False
+
+    def record_failure(self):
+        with self._lock:
+            self.failures += 1
+            if self._probing or self.failures >= self.threshold:
+                self.opened_at = time.monotonic()
+            self._probing = False
+
+def _status_code(error):
+    code = getattr(error, "code", None)
+    if callable(code):
+        # grpc errors expose code() returning a StatusCode enum
+        return None
+    if isinstance(code, int):
+        return code
+    response = getattr(error, "response", None)
+    status = getattr(response, "status_code", None)
+    return status if isinstance(status, int) else None
+
+def is_rate_limit(error):
+    return type(error).__name__ in RATE_LIMIT_NAMES or _status_code(error) == 429
+
+def is_retryable(error):
+    if isinstance(error, (ConnectionError, TimeoutError)):
+        return True
+    return type(error).__name__ in RETRYABLE_NAMES or _status_code(error) in RETRYABLE_STATUS_CODES
+
+def backoff_delay(attempt, base=BACKOFF_BASE, cap=BACKOFF_MAX):
+    """
+    Full-jitter exponential backoff for the given retry attempt (0-based).
+    """
+    return random.uniform(0, min(cap, base * (2 ** attempt)))
+
+class ResilientCaller:
+    """
+    Runs LLM calls through the rate limiter, retry loop and circuit breaker,
+    translating SDK exceptions into the typed errors in llm_api.errors.
+    """
+    def __init__(self, limiter=None, breaker=None, max_retries=MAX_RETRIES, sleep=time.sleep):
+        self.limiter = limiter or RateLimiter()
+        self.breaker = breaker or CircuitBreaker()
+        self.max_retries = max_retries
+        self.sleep = sleep
+
+    def _handle_failure(self, error, attempt):
+        # Raises the typed error if this failure is final, otherwise returns the backoff delay
+        if not is_retryable(error):
+            # The upstream answered, so it is healthy; the request itself is at fault
+            self.breaker.record_success()
+            raise LLMRequestError(str(error)) from error
+        if attempt >= self.max_retries:
+            self.breaker.record_failure()
+            error_type = LLMRateLimitError if is_rate_limit(error) else LLMRetryableError
+            raise error_type(f"{error} (after {attempt + 1} attempts)") from error
+        return backoff_delay(attempt)
+
+    def call(self, fn, tokens=1):
+        probe = self.breaker.before_call()
+        try:
+            attempt = 0
+            while True:
+                self.limiter.acquire(tokens)
+                try:
+                    result = fn()
+                except LLMError:
+                    raise
+                except Exception as e:
+                    self.sleep(self._handle_failure(e, attempt))
+                    attempt += 1
+                    continue
+                self.breaker.record_success()
+                return result
+        finally:
+            # No-op when an outcome was recorded; otherwise the breaker would stay half-open forever
+            if probe:
+                self.breaker.release_probe()
+
+    async def call_async(self, fn, tokens=1):
+        """
+        Async counterpart of call(); fn is a zero-argument coroutine function.
+        """
+        probe = self.breaker.before_call()
+        try:
+            attempt = 0
+            while True:
+                await self.limiter.acquire_async(tokens)
+                try:
+                    result = await fn()
+                except LLMError:
+                    raise
+                except Exception as e:
+                    await asyncio.sleep(self._handle_failure(e, attempt))
+                    attempt += 1
+                    continue
+                self.breaker.record_success()
+                return result
+        finally:
+            if probe:
+                self.breaker.release_probe()
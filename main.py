@@ -1,379 +1,17 @@
-# Imports
-import os
-from flask import Flask, request, jsonify
-from flask_cors import CORS
-
-# Custom imports
-import scraper
-import bias
-import media
-from metrics import get_drama_index
-from metrics import return_biased_score
-from diff import html_diff
-from outlet_bias import NewsOutlet
-from media.yt import download_youtube
-from bias.overall_summary import generate_overall_summary
-
-app = Flask(__name__)
-CORS(app)
-
-@app.route("/fetch-url", methods=["POST"])
-def fetch_url():
-    data = request.get_json()
-    url = data.get("url")
-
-    if not url:
-        return jsonify({
-            "status": "error",
-            "message": "URL not provided"
-        }), 400
-
-    try:
-        content = scraper.get_content(url)
-    except Exception as e:
-        return jsonify({
-            "status": "error",
-            "message": str(e)
-        }), 500
-
-    text = content['text']
-
-    # Segment text into paragraphs and analyze bias
-    paragraphs = bias.segment_paragraphs(text)
-
-    # Convert paragraphs to JSON representation
-    paragraphs_json = []
-    reasons = []
-    for para in paragraphs:
-        paragraphs_json.append({
-            "text": para.text,
-            "bias_score": para.is_text_biased_enough,
-            "unbiased_replacement": para.unbiased_replacement,
-            "reason_biased": para.reason_biased,
-            "differences": html_diff(para.text, para.unbiased_replacement)
-        })
-        if para.is_text_biased_enough and para.reason_biased:
-            reasons.append(para.reason_biased)
-
-    # Calculate drama index as the bias_score
-    try:
-        drama_result = get_drama_index(text)
-        bias_score, bias_reason = return_biased_score(text)
-    except Exception:
-        bias_score, bias_reason = None, None
-    # Generate an overall summary explaining bias and drama reasoning (best-effort)
-    bias_summary = None
-    drama_summary = None
-    try:
-        bias_summary, drama_summary = generate_overall_summary(
-            title=content.get("title", ""),
-            summary_text=content.get("summary", ""),
-            bias_score=bias_score,
-            drama_index=(drama_result[0] if isinstance(drama_result, list) else drama_result) if 'drama_result' in locals() else None,
-            reasons=reasons,
-        )
-    except Exception:
-        pass
-
-    # Debug: log what we're returning
-    print(f"DEBUG: bias_summary={bias_summary}")
-    print(f"DEBUG: drama_summary={drama_summary}")
-
-
-    return jsonify({
-        "status": "ok",
-        "data": {
-            "paragraphs": paragraphs_json,
-            "bias_score": bias_score,
-            "bias_summary": bias_summary,
-            "drama_summary": drama_summary,
-            "bias_reason": bias_reason,
-            "title": content.get("title", ""),
-            "authors": content.get("authors", []),
-            "date": content.get("date", ""),
-            "top_image": content.get("top_image", ""),
-            "summary": content.get("summary", ""),
-            "keywords": content.get("keywords", []),
-            "reasons": reasons
-        }
-    }), 200
-
-@app.route("/fetch-outlet-bias", methods=["POST"])
-def fetch_outlet_bias():
-    data = request.get_json()
-    url = data.get("url")
-
-    if not url:
-        return jsonify({
-            "status": "error",
-            "message": "URL not provided"
-        }), 400
-
-    try:
-        outlet = NewsOutlet(url)
-        return jsonify({
-            "status": "ok",
-            "data": outlet.json()
-        }), 200
-    except Exception as e:
-        return jsonify({
-            "status": "error",
-            "message": str(e)
-        }), 500
-
-@app.route("/fetch-audio", methods=["POST"])
-def fetch_audio():
-    if "file" not in request.files:
-        return jsonify({"status": "error", "message": "No file provided"}), 400
-
-    file = request.files["file"]
-    if file.filename == "":
-        return jsonify({"status": "error", "message": "No file selected"}), 400
-
-    filename = file.filename
-    save_path = os.path.join(os.path.dirname(__file__), "user_downloads", filename)
-    file.save(save_path)
-
-    try:
-        text = media.audio_to_text(filename)
-        if text.startswith("Error:"):
-            return jsonify({"status": "error", "message": text}), 500
-
-        paragraphs = bias.segment_paragraphs(text)
-        paragraphs_json = []
-        reasons = []
-        for para in paragraphs:
-            paragraphs_json.append(para.json())
-            if para.is_text_biased_enough and para.reason_biased:
-                reasons.append(para.reason_biased)
-
-        # Calculate drama index as the bias_score
-        try:
-            drama_result = get_drama_index(text)
-            bias_score = drama_result[0] if isinstance(drama_result, list) else drama_result
-        except Exception:
-            bias_score = None
-
-        try:
-            bias_summary, drama_summary = generate_overall_summary(
-                title="",
-                summary_text=text,
-                bias_score=bias_score,
-                drama_index=(drama_result[0] if isinstance(drama_result, list) else drama_result) if 'drama_result' in locals() else None,
-                reasons=reasons,
-            )
-        except Exception:
-            bias_summary = None
-            drama_summary = None
-
-        return jsonify({
-            "status": "ok",
-            "data": {
-                "text": text,
-                "paragraphs": paragraphs_json,
-                "bias_score": bias_score,
-                "summary": text,
-                "reasons": reasons,
-                "bias_summary": bias_summary,
-                "drama_summary": drama_summary,
-            }
-        }), 200
-    except Exception as e:
-        return jsonify({"status": "error", "message": str(e)}), 500
-    data = request.get_json()
-    filename = data.get("filename")
-
-    if not filename:
-        return jsonify({
-            "status": "error",
-            "message": "Filename not provided"
-        }), 400
-
-    try:
-        text = media.audio_to_text(filename)
-        return jsonify({
-            "status": "ok",
-            "text": text
-        }), 200
-    except Exception as e:
-        return jsonify({
-            "status": "error",
-            "message": str(e)
-        }), 500
-    
-@app.route("/fetch-video", methods=["POST"])
-def fetch_video():
-    data = request.get_json()
-    if not data or "url" not in data:
-        return jsonify({"status": "error", "message": "No YouTube URL provided"}), 400
-
-    url = data["url"].strip()
-    if not url:
-        return jsonify({"status": "error", "message": "Empty URL"}), 400
-
-    downloads_dir = os.path.join(os.path.dirname(__file__), "user_downloads")
-    os.makedirs(downloads_dir, exist_ok=True)
-
-    try:
-        import yt_dlp
-
-        ydl_opts = {
-            "format": "bestaudio/best",
-            "outtmpl": os.path.join(downloads_dir, "%(id)s.%(ext)s"),
-            "quiet": True,
-            "postprocessors": [{
-                "key": "FFmpegExtractAudio",
-                "preferredcodec": "wav",
-            }],
-        }
-
-        with yt_dlp.YoutubeDL(ydl_opts) as ydl:
-            info = ydl.extract_info(url, download=True)
-            video_id = info["id"]
-
-        audio_filename = f"{video_id}.wav"
-        audio_path = os.path.join(downloads_dir, audio_filename)
-
-        text = media.audio_to_text(audio_filename)
-        if not text or text.startswith("Error:"):
-            return jsonify({"status": "error", "message": text}), 500
-
-        paragraphs = bias.segment_paragraphs(text)
-        paragraphs_json = []
-        reasons = []
-        for para in paragraphs:
-            paragraphs_json.append({
-                "text": para.text,
-                "bias_score": para.is_text_biased_enough,
-                "unbiased_replacement": para.unbiased_replacement,
-                "reason_biased": para.reason_biased,
-                "differences": html_diff(para.text, para.unbiased_replacement)
-            })
-            if para.is_text_biased_enough and para.reason_biased:
-                reasons.append(para.reason_biased)
-
-        # Calculate drama index as the bias_score
-        try:
-            drama_result = get_drama_index(text)
-            bias_score = drama_result[0] if isinstance(drama_result, list) else drama_result
-        except Exception:
-            bias_score = None
-
-        try:
-            bias_summary, drama_summary = generate_overall_summary(
-                title="",
-                summary_text=text,
-                bias_score=bias_score,
-                drama_index=(drama_result[0] if isinstance(drama_result, list) else drama_result) if 'drama_result' in locals() else None,
-                reasons=reasons,
-            )
-        except Exception:
-            bias_summary = None
-            drama_summary = None
-
-        return jsonify({
-            "status": "ok",
-            "data": {
-                "text": text,
-                "paragraphs": paragraphs_json,
-                "bias_score": bias_score,
-                "summary": text,
-                "reasons": reasons,
-                "bias_summary": bias_summary,
-                "drama_summary": drama_summary,
-            }
-        }), 200
-
-    except Exception as e:
-        print("FETCH VIDEO ERROR:", e)
-        return jsonify({"status": "error", "message": str(e)}), 500
-
-
-@app.route("/search-similar", methods=["POST"])
-def search_similar():
-    data = request.get_json()
-    query = data.get("query")
-    url = data.get("url")
-
-    if not query:
-        return jsonify({
-            "status": "error",
-            "message": "Query not provided"
-        }), 400
-
-    try:
-        if url:
-            articles = scraper.search_urls(query, url)
-        else:
-            articles = scraper.search_urls(query)
-        return jsonify({
-            "status": "ok",
-            "data": articles
-        }), 200
-    except Exception as e:
-        return jsonify({
-            "status": "error",
-            "message": str(e)
-        }), 500
-
-@app.route("/get-drama-index", methods=["POST"])
-def get_drama_index_route():
-    data = request.get_json()
-    text = data.get("text")
-    
-    if not text:
-        return jsonify({
-            "status": "error",
-            "message": "Text not provided"
-        }), 400
-    
-    try:
-        drama_result = get_drama_index(text)
-        if isinstance(drama_result, list):
-            drama_index = [drama_result[0], drama_result[1]]
-        else:
-            drama_index = [drama_result, {}]
-        return jsonify({
-            "status": "success",
-            "drama_index": drama_index
-        }), 200
-    except Exception as e:
-        return jsonify({
-            "status": "error",
-            "message": str(e)
-        }), 500
-    
-@app.route("/convert-yt", methods=["POST"])
-def convert_yt():
-    data = request.get_json()
-    url = data.get("url")
-
-    if not url:
-        return jsonify({
-            "status": "error",
-            "message": "URL not provided"
-        }), 400
-
-    try:
-        audio_filename = download_youtube(url)
-        text = media.audio_to_text(audio_filename)
-        
-        if text.startswith("Error:"):
-            return jsonify({
-                "status": "error",
-                "message": text
-            }), 500
-        
-        return jsonify({
-            "status": "ok",
-            "text": text
-        }), 200
-    except Exception as e:
-        return jsonify({
-            "status": "error",
-            "message": str(e)
-        }), 500
+# Entry point: python main.py
+# The app lives in app.py. Spawned worker processes (drama inference pool,
+# article parse pool) re-import this file as __mp_main__ before running any
+# task, so it must not import the app or anything heavy at module level.
 
+# Tells app.py not to start the job queue on import: the debug reloader runs this
+# file twice, a parent that only watches files and a child that serves requests
+MANAGES_JOB_QUEUE = True
 
 if __name__ == "__main__":
+    import os
+    from app import app, get_job_queue
+
+    if os.environ.get("WERKZEUG_RUN_MAIN") == "true":
+        # Build the queue at startup so jobs queued or running before a restart resume right away
+        get_job_queue()
     app.run(debug = True, port = 5000)
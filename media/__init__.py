@@ -1,6 +1,6 @@
-from .audio import audio_to_text
+from .audio import audio_to_text, transcribe_audio, transcribe_file, transcription_report
 from .yt import download_youtube
 
-__all__ = ["audio_to_text", "download_youtube"]
+__all__ = ["audio_to_text", "transcribe_audio", "transcribe_file", "transcription_report", "download_youtube"]
 
 # print(audio_to_text("test_audio.m4a"))
\ No newline at end of file
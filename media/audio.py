@@ -1,100 +1,127 @@
 import speech_recognition as sr
 from pydub import AudioSegment
+import io
 import os
-import gc
 import time
-from llm_api import Prompt
+from concurrent.futures import ThreadPoolExecutor
+from llm_api import generate, LLMError
 
 print("media audio.py imports finished")
 
-def audio_to_text(filename):
-    # Build the file path
+# Audio is decoded once, downmixed to mono at AUDIO_SAMPLE_RATE, and cut into
+# AUDIO_CHUNK_SECONDS chunks. Each chunk is encoded to an in-memory WAV buffer
+# and recognized by a pool of AUDIO_TRANSCRIBE_WORKERS threads; the transcript
+# is reassembled in order. A chunk that keeps failing is reported and skipped
+# instead of aborting the whole file.
+CHUNK_MS = int(float(os.getenv("AUDIO_CHUNK_SECONDS", "50")) * 1000)
+SAMPLE_RATE = int(os.getenv("AUDIO_SAMPLE_RATE", "16000"))
+TRANSCRIBE_WORKERS = int(os.getenv("AUDIO_TRANSCRIBE_WORKERS", "4"))
+CHUNK_RETRIES = int(os.getenv("AUDIO_CHUNK_RETRIES", "2"))
+RETRY_BACKOFF = float(os.getenv("AUDIO_RETRY_BACKOFF", "1"))
+
+def _wav_buffer(segment):
+    buffer = io.BytesIO()
+    segment.export(buffer, format="wav")
+    buffer.seek(0)
+    return buffer
+
+def _recognize_chunk(audio, start, end):
+    """
+    Recognizes audio[start:end] (milliseconds), retrying request errors with backoff.
+    Returns "" for chunks with no recognizable speech.
+    """
+    recognizer = sr.Recognizer()
+    buffer = _wav_buffer(audio[start:end])
+    for attempt in range(CHUNK_RETRIES + 1):
+        buffer.seek(0)
+        try:
+            with sr.AudioFile(buffer) as source:
+                audio_data = recognizer.record(source)
+            return recognizer.recognize_google(audio_data)
+        except sr.UnknownValueError:
+            return ""
+        except sr.RequestError:
+            if attempt == CHUNK_RETRIES:
+                raise
+            time.sleep(RETRY_BACKOFF * (2 ** attempt))
+
+def transcribe_audio(audio_path, max_workers=None):
+    """
+    Transcribes an audio file without punctuation.
+    Returns a dict with:
+    - text: recognized text of all chunks, in order
+    - chunks: number of chunks
+    - failed: [{"index", "start_ms", "end_ms", "error"}] for chunks that failed after retries
+    """
+    audio = AudioSegment.from_file(audio_path).set_channels(1).set_frame_rate(SAMPLE_RATE)
+    duration_ms = len(audio)
+    bounds = [(start, min(start + CHUNK_MS, duration_ms)) for start in range(0, max(1, duration_ms), CHUNK_MS)]
+
+    def recognize(bound):
+        try:
+            return _recognize_chunk(audio, *bound), None
+        except sr.RequestError as e:
+            return "", e
+
+    with ThreadPoolExecutor(max_workers=max_workers or TRANSCRIBE_WORKERS) as executor:
+        results = list(executor.map(recognize, bounds))
+
+    failed = [
+        {"index": index, "start_ms": start, "end_ms": end, "error": str(error)}
+        for index, ((start, end), (_, error)) in enumerate(zip(bounds, results)) if error is not None
+    ]
+    return {
+        "text": " ".join(text for text, _ in results if text),
+        "chunks": len(bounds),
+        "failed": failed,
+    }
+
+def punctuate(raw_text):
+    # Gemini punctuation
+    try:
+        return generate(f"Add proper punctuation to this text without changing the words. The text was extracted from an audio so there is a slight possbility that some words were heard wrong. In that case, do change any wrong words. WHEN RETURNING THE TEXT, DO NOT PUT QUOTATIONS AROUND THE TEXT. ONLY PUT QUOTATIONS IF THERE IS, FOR EXAMPLE, AN ACTUAL QUOTE WITHIN THE TEXT I PROVIDE YOU: {raw_text}")
+    except LLMError:
+        # Unpunctuated text is still usable for analysis
+        return raw_text
+
+def audio_path_for(filename):
     project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
-    audio_path = os.path.join(project_root, "user_downloads", filename)
-    
+    return os.path.join(project_root, "user_downloads", filename)
+
+def transcribe_file(filename):
+    """
+    Transcribes and punctuates a file in user_downloads.
+    Returns transcribe_audio's dict (text, chunks, failed) plus error: an
+    "Error: ..." message when the file is missing or no text was recognized,
+    else None. failed lists chunks missing from an otherwise usable transcript.
+    """
+    audio_path = audio_path_for(filename)
     if not os.path.exists(audio_path):
-        return f"Error: File not found at {audio_path}"
-    
+        return {"text": "", "chunks": 0, "failed": [], "error": f"Error: File not found at {audio_path}"}
+
     try:
-        recognizer = sr.Recognizer()
-        
-        is_already_wav = audio_path.lower().endswith('.wav')
-        wav_path = audio_path
-        
-        if not is_already_wav:
-            audio = AudioSegment.from_file(audio_path)
-            wav_path = audio_path.replace(os.path.splitext(audio_path)[1], ".wav")
-            audio.export(wav_path, format="wav")
-
-            del audio
-            gc.collect()
-            time.sleep(0.5)
-        
-        import tempfile
-
-        audio_segment = AudioSegment.from_wav(wav_path)
-        duration_ms = len(audio_segment)
-
-        CHUNK_MS = 50 * 1000
-
-        texts = []
-        if duration_ms <= CHUNK_MS:
-            with sr.AudioFile(wav_path) as source:
-                audio_data = recognizer.record(source)
-                raw_text = recognizer.recognize_google(audio_data)
-                texts.append(raw_text)
-        else:
-            for start in range(0, duration_ms, CHUNK_MS):
-                end = min(start + CHUNK_MS, duration_ms)
-                chunk = audio_segment[start:end]
-                tf = tempfile.NamedTemporaryFile(delete=False, suffix=".wav")
-                temp_path = tf.name
-                tf.close()
-                chunk.export(temp_path, format="wav")
-                del chunk
-                gc.collect()
-                time.sleep(0.05)
-
-                try:
-                    with sr.AudioFile(temp_path) as source:
-                        audio_data = recognizer.record(source)
-                        raw_text = recognizer.recognize_google(audio_data)
-                        texts.append(raw_text)
-                except sr.UnknownValueError:
-                    pass
-                except sr.RequestError as e:
-                    try:
-                        os.remove(temp_path)
-                    except Exception:
-                        pass
-                    return f"Error: {e}"
-                finally:
-                    try:
-                        os.remove(temp_path)
-                    except Exception:
-                        pass
-
-        raw_text = " ".join(t for t in texts if t)
-
-        gc.collect()
-
-        # Gemini punctuation
-        chat = Prompt()
-        punctuated_text = chat.prompt(f"Add proper punctuation to this text without changing the words. The text was extracted from an audio so there is a slight possbility that some words were heard wrong. In that case, do change any wrong words. WHEN RETURNING THE TEXT, DO NOT PUT QUOTATIONS AROUND THE TEXT. ONLY PUT QUOTATIONS IF THERE IS, FOR EXAMPLE, AN ACTUAL QUOTE WITHIN THE TEXT I PROVIDE YOU: {raw_text}")
-
-        if not is_already_wav and os.path.exists(wav_path):
-            try:
-                time.sleep(0.2)
-                os.remove(wav_path)
-            except Exception:
-                pass
-
-        return punctuated_text
-        # return raw_text
-    
-    except sr.UnknownValueError:
-        return "Error: Could not understand audio"
-    except sr.RequestError as e:
-        return f"Error: {e}"
+        transcription = transcribe_audio(audio_path)
     except Exception as e:
-        return f"Error: {str(e)}"
+        return {"text": "", "chunks": 0, "failed": [], "error": f"Error: {str(e)}"}
+
+    failed = transcription["failed"]
+    if failed and len(failed) == transcription["chunks"]:
+        return dict(transcription, error=f"Error: {failed[0]['error']}")
+    if not transcription["text"]:
+        return dict(transcription, error="Error: Could not understand audio")
+    if failed:
+        print(f"Transcription of {filename}: {len(failed)}/{transcription['chunks']} chunks failed "
+              f"({', '.join(str(chunk['index']) for chunk in failed)})")
+
+    return dict(transcription, text=punctuate(transcription["text"]), error=None)
+
+def transcription_report(transcription):
+    """
+    Chunk counts for API responses, so clients can tell a gappy transcript from a complete one.
+    """
+    return {"chunks": transcription["chunks"], "failed": transcription["failed"]}
+
+def audio_to_text(filename):
+    # Transcript text only, or an "Error: ..." message
+    transcription = transcribe_file(filename)
+    return transcription["error"] or transcription["text"]
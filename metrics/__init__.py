@@ -1,4 +1,24 @@
-from .metrics import get_drama_index
-from .bias_score import return_biased_score
+import importlib
 
-__all__ = ["get_drama_index", "return_biased_score"]
+# Exports are imported on first use, so worker processes that only need
+# metrics.backends (see metrics/pool_worker.py) don't load the tokenizer,
+# the lexicons or the Gemini client.
+_EXPORTS = {
+    "get_drama_index": ".metrics",
+    "get_drama_index_batch": ".metrics",
+    "get_drama_index_windowed": ".metrics",
+    "get_drama_index_async": ".metrics",
+    "get_paragraph_drama": ".metrics",
+    "score_paragraphs": ".metrics",
+    "return_biased_score": ".bias_score",
+    "return_biased_score_async": ".bias_score",
+}
+
+__all__ = list(_EXPORTS)
+
+def __getattr__(name):
+    if name not in _EXPORTS:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(_EXPORTS[name], __name__), name)
+    globals()[name] = value
+    return value
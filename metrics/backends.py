@@ -0,0 +1,105 @@
+import os
+import numpy as np
+
+# Inference backends for the emotion model. All take padded numpy input_ids /
+# attention_mask batches and return numpy logits, so metrics.py doesn't care which runs.
+#   torch      eager PyTorch (default)
+#   onnx       exported ONNX Runtime graph
+#   onnx-int8  the same graph with dynamically int8-quantized weights
+# Export the ONNX files once with: python -m metrics.export_onnx
+# threads caps the intra-op threads a backend uses (None keeps the library default).
+
+ONNX_DIR = os.getenv("DRAMA_ONNX_DIR", os.path.join(os.path.dirname(__file__), "onnx"))
+ONNX_FILES = {
+    "onnx": "model.onnx",
+    "onnx-int8": "model.int8.onnx",
+}
+BACKENDS = ["torch", "onnx", "onnx-int8"]
+
+class TorchBackend:
+    name = "torch"
+
+    def __init__(self, model_name, threads=None):
+        import torch
+        from transformers import AutoModelForSequenceClassification
+
+        if threads:
+            torch.set_num_threads(threads)
+        self.torch = torch
+        self.model = AutoModelForSequenceClassification.from_pretrained(model_name, use_safetensors=True)
+        self.model.eval()
+
+    def logits(self, input_ids, attention_mask):
+        with self.torch.no_grad():
+            output = self.model(
+                input_ids=self.torch.from_numpy(input_ids),
+                attention_mask=self.torch.from_numpy(attention_mask)
+            )
+        return output.logits.cpu().numpy()
+
+class OnnxBackend:
+    def __init__(self, name, path, threads=None):
+        import onnxruntime as ort
+
+        if not os.path.exists(path):
+            raise FileNotFoundError(f"{path} not found; export it first with: python -m metrics.export_onnx")
+        self.name = name
+        self.path = path
+        options = ort.SessionOptions()
+        options.graph_optimization_level = ort.GraphOptimizationLevel.ORT_ENABLE_ALL
+        if threads:
+            options.intra_op_num_threads = threads
+            options.inter_op_num_threads = 1
+        self.session = ort.InferenceSession(path, options, providers=["CPUExecutionProvider"])
+
+    def logits(self, input_ids, attention_mask):
+        return self.session.run(["logits"], {
+            "input_ids": input_ids.astype(np.int64),
+            "attention_mask": attention_mask.astype(np.int64),
+        })[0]
+
+def load_backend(name, model_name, threads=None):
+    if name == "torch":
+        return TorchBackend(model_name, threads)
+    if name in ONNX_FILES:
+        return OnnxBackend(name, os.path.join(ONNX_DIR, ONNX_FILES[name]), threads)
+    raise ValueError(f"Unknown drama index backend {name!r}; expected one of {BACKENDS}")
+
+def export_onnx(model_name, output_dir=ONNX_DIR, quantize=True):
+    """
+    Exports the emotion model to ONNX (and optionally a dynamically int8-quantized copy).
+    Returns the paths written.
+    """
+    import torch
+    from transformers import AutoModelForSequenceClassification
+
+    os.makedirs(output_dir, exist_ok=True)
+    model = AutoModelForSequenceClassification.from_pretrained(model_name, use_safetensors=True)
+    model.eval()
+
+    fp32_path = os.path.join(output_dir, ONNX_FILES["onnx"])
+    dummy_ids = torch.ones((1, 16), dtype=torch.long)
+    dummy_mask = torch.ones((1, 16), dtype=torch.long)
+    torch.onnx.export(
+        model,
+        (dummy_ids, dummy_mask),
+        fp32_path,
+        input_names=["input_ids", "attention_mask"],
+        output_names=["logits"],
+        dynamic_axes={
+            "input_ids": {0: "batch", 1: "sequence"},
+            "attention_mask": {0: "batch", 1: "sequence"},
+            "logits": {0: "batch"},
+        },
+        opset_version=17,
+    )
+    paths = [fp32_path]
+
+    if quantize:
+        from onnxruntime.quantization import quantize_dynamic, QuantType
+
+        int8_path = os.path.join(output_dir, ONNX_FILES["onnx-int8"])
+        quantize_dynamic(fp32_path, int8_path, weight_type=QuantType.QInt8)
+        paths.append(int8_path)
+
+    return paths
@@ -0,0 +1,36 @@
+import os
+import sys
+import time
+from .metrics import get_drama_index, get_drama_index_batch
+
+# Throughput of the per-call drama index loop vs. batched inference on CPU.
+# Usage: python -m metrics.benchmark [corpus.txt] [batch_size ...]
+# The corpus is one text per line; defaults to metrics/benchmark_corpus.txt.
+
+CORPUS_PATH = os.path.join(os.path.dirname(__file__), "benchmark_corpus.txt")
+
+def load_corpus(path=CORPUS_PATH):
+    with open(path, "r") as f:
+        return [line.strip() for line in f if line.strip()]
+
+def timed(fn, *args, **kwargs):
+    start = time.perf_counter()
+    result = fn(*args, **kwargs)
+    return result, time.perf_counter() - start
+
+if __name__ == "__main__":
+    path = sys.argv[1] if len(sys.argv) > 1 else CORPUS_PATH
+    batch_sizes = [int(b) for b in sys.argv[2:]] or [8, 16, 32]
+    texts = load_corpus(path)
+
+    # Warm up so the first timed run doesn't pay for lazy initialization
+    get_drama_index_batch(texts[:4])
+
+    loop_results, loop_time = timed(lambda: [get_drama_index(t) for t in texts])
+    print(f"per-call loop: {len(texts) / loop_time:7.1f} texts/s ({loop_time:.2f}s for {len(texts)} texts)")
+
+    for batch_size in batch_sizes:
+        batch_results, batch_time = timed(get_drama_index_batch, texts, batch_size=batch_size)
+        mismatches = sum(1 for a, b in zip(loop_results, batch_results) if a[0] != b[0])
+        print(f"batch size {batch_size:>3}: {len(texts) / batch_time:7.1f} texts/s "
+              f"({loop_time / batch_time:.2f}x, {mismatches} score mismatches)")
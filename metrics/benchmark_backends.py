@@ -0,0 +1,45 @@
+import sys
+import time
+import numpy as np
+from .backends import BACKENDS
+from .benchmark import load_corpus, CORPUS_PATH
+from .metrics import get_backend, _emotion_probs_batch, _drama_index_from_emotions, EMOTIONS
+
+# Accuracy vs. latency of the drama index inference backends on a fixed corpus.
+# Accuracy is measured against the torch backend.
+# Usage: python -m metrics.benchmark_backends [corpus.txt]
+
+def run(backend, texts, repeats=3):
+    _emotion_probs_batch(texts[:4], backend=backend)
+    best = None
+    for _ in range(repeats):
+        start = time.perf_counter()
+        emotions = _emotion_probs_batch(texts, backend=backend)
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    probs = np.array([[e[k] for k in EMOTIONS] for e in emotions])
+    scores = np.array([_drama_index_from_emotions(t, e)[0] for t, e in zip(texts, emotions)])
+    return probs, scores, best
+
+if __name__ == "__main__":
+    texts = load_corpus(sys.argv[1] if len(sys.argv) > 1 else CORPUS_PATH)
+
+    reference = None
+    for name in BACKENDS:
+        try:
+            backend = get_backend(name)
+        except Exception as e:
+            print(f"{name:>9}: skipped ({e})")
+            continue
+
+        probs, scores, elapsed = run(backend, texts)
+        if reference is None:
+            reference = (probs, scores, elapsed)
+        ref_probs, ref_scores, ref_elapsed = reference
+
+        prob_error = np.abs(probs - ref_probs).mean()
+        label_agreement = (probs.argmax(axis=1) == ref_probs.argmax(axis=1)).mean() * 100
+        score_error = np.abs(scores - ref_scores)
+        print(f"{name:>9}: {elapsed * 1000 / len(texts):6.2f} ms/text ({ref_elapsed / elapsed:.2f}x) | "
+              f"mean |dprob| {prob_error:.4f} | top emotion agreement {label_agreement:.1f}% | "
+              f"score diff mean {score_error.mean():.2f} max {score_error.max()}")
@@ -0,0 +1,50 @@
+import random
+import sys
+import threading
+import time
+import numpy as np
+from . import metrics
+from .benchmark import load_corpus, CORPUS_PATH
+
+# Throughput and latency of concurrent drama index requests, with and without
+# the micro-batching dispatcher.
+# Usage: python -m metrics.benchmark_dispatcher [threads] [requests_per_thread]
+
+def simulate(texts, threads, requests_per_thread, use_dispatcher):
+    metrics.DISPATCHER = use_dispatcher
+    latencies = []
+    lock = threading.Lock()
+
+    def client(seed):
+        rng = random.Random(seed)
+        for _ in range(requests_per_thread):
+            text = rng.choice(texts)
+            start = time.perf_counter()
+            metrics.get_drama_index(text)
+            elapsed = time.perf_counter() - start
+            with lock:
+                latencies.append(elapsed)
+
+    workers = [threading.Thread(target=client, args=(i,)) for i in range(threads)]
+    start = time.perf_counter()
+    for worker in workers:
+        worker.start()
+    for worker in workers:
+        worker.join()
+    total = time.perf_counter() - start
+
+    latencies = np.array(latencies) * 1000
+    return len(latencies) / total, np.percentile(latencies, 50), np.percentile(latencies, 99)
+
+if __name__ == "__main__":
+    threads = int(sys.argv[1]) if len(sys.argv) > 1 else 16
+    requests_per_thread = int(sys.argv[2]) if len(sys.argv) > 2 else 10
+    texts = load_corpus(CORPUS_PATH)
+
+    # Warm up the backend before timing
+    metrics.get_drama_index_batch(texts[:4], batch_size=4)
+
+    print(f"{threads} concurrent clients x {requests_per_thread} requests")
+    for name, use_dispatcher in [("per-thread", False), ("dispatcher", True)]:
+        throughput, p50, p99 = simulate(texts, threads, requests_per_thread, use_dispatcher)
+        print(f"{name:>10}: {throughput:7.1f} req/s | p50 {p50:8.1f} ms | p99 {p99:8.1f} ms")
@@ -0,0 +1,43 @@
+import sys
+import time
+from .lexicon import LexiconMatcher
+from .benchmark import load_corpus, CORPUS_PATH
+
+# Micro-benchmark of the compiled lexicon matcher against the old per-token
+# lowercase/split/strip loop, on megabyte-scale synthetic transcripts.
+# Usage: python -m metrics.benchmark_lexicon [megabytes ...]
+
+def legacy_counts(text, power_words, absolutist):
+    words = text.lower().split()
+    power = sum(1 for w in words if w.strip(".,!?") in power_words)
+    absolute = sum(1 for w in words if w.strip(".,!?") in absolutist)
+    return power, absolute
+
+def make_transcript(texts, megabytes):
+    paragraph = " ".join(texts)
+    repeats = max(1, int(megabytes * 1024 * 1024 / len(paragraph)))
+    return " ".join([paragraph] * repeats)
+
+def best_of(fn, repeats=3):
+    best = None
+    for _ in range(repeats):
+        start = time.perf_counter()
+        result = fn()
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return result, best
+
+if __name__ == "__main__":
+    sizes = [float(mb) for mb in sys.argv[1:]] or [1, 4]
+    matcher = LexiconMatcher.from_dir()
+    power_words = set(matcher.lexicons["power_words"])
+    absolutist = set(matcher.lexicons["absolutist"])
+    texts = load_corpus(CORPUS_PATH)
+
+    for megabytes in sizes:
+        transcript = make_transcript(texts, megabytes)
+        size = len(transcript.encode("utf-8")) / (1024 * 1024)
+        (power, absolute), legacy_time = best_of(lambda: legacy_counts(transcript, power_words, absolutist))
+        counts, compiled_time = best_of(lambda: matcher.count(transcript))
+        print(f"{size:5.1f} MB | legacy {size / legacy_time:6.1f} MB/s ({power:.0f} power, {absolute:.0f} absolutist) | "
+              f"compiled {size / compiled_time:6.1f} MB/s ({counts['power_words']:.0f} power, {counts['absolutist']:.0f} absolutist)")
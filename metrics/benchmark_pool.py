@@ -0,0 +1,46 @@
+import os
+import sys
+import threading
+import time
+from . import metrics
+from .pool import InferencePool
+from .benchmark import load_corpus, CORPUS_PATH
+
+# Drama index throughput under concurrent clients for different
+# workers x threads splits of the same cores, against the in-process backend.
+# Usage: python -m metrics.benchmark_pool [clients] [WORKERSxTHREADS ...]
+# e.g.   python -m metrics.benchmark_pool 16 1x8 2x4 4x2 8x1
+
+def run_clients(texts, clients, backend, rounds=3):
+    def client():
+        for _ in range(rounds):
+            metrics.get_drama_index_batch(texts, backend=backend)
+
+    threads = [threading.Thread(target=client) for _ in range(clients)]
+    start = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return clients * rounds * len(texts) / (time.perf_counter() - start)
+
+def parse_config(config):
+    workers, threads = config.lower().split("x")
+    return int(workers), int(threads)
+
+if __name__ == "__main__":
+    clients = int(sys.argv[1]) if len(sys.argv) > 1 else 8
+    cores = os.cpu_count() or 1
+    configs = [parse_config(c) for c in sys.argv[2:]] or [(1, cores), (2, max(1, cores // 2)), (4, max(1, cores // 4))]
+    texts = load_corpus(CORPUS_PATH)[:16]
+
+    print(f"{clients} concurrent clients, {len(texts)} texts per request, {cores} cores")
+    backend = metrics.load_backend(metrics.BACKEND, metrics.MODEL_NAME)
+    metrics.get_drama_index_batch(texts[:2], backend=backend)
+    print(f"{'in-process':>12}: {run_clients(texts, clients, backend):7.1f} texts/s")
+
+    for workers, threads in configs:
+        pool = InferencePool(metrics.BACKEND, metrics.MODEL_NAME, workers, threads)
+        pool.warm_up()
+        print(f"{f'{workers}x{threads}':>12}: {run_clients(texts, clients, pool):7.1f} texts/s")
+        pool.shutdown()
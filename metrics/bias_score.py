@@ -1,4 +1,4 @@
-from llm_api import Prompt
+from llm_api import generate, generate_async
 import os
 
 # Read the system prompt from file
@@ -7,9 +7,14 @@ with open(prompt_file_path, "r") as f:
     SYSTEM_PROMPT = f.read()
 
 def return_biased_score(text):
-    chat = Prompt(system_message=SYSTEM_PROMPT)
-    response = chat.prompt(text)
-    
+    response = generate(text, system_message=SYSTEM_PROMPT)
+    return _parse_bias_score(response)
+
+async def return_biased_score_async(text):
+    response = await generate_async(text, system_message=SYSTEM_PROMPT)
+    return _parse_bias_score(response)
+
+def _parse_bias_score(response):
     score, reasoning = -1, []
     print(response)
     for i in response.split("\n"):
@@ -0,0 +1,67 @@
+import queue
+import threading
+import time
+from concurrent.futures import Future
+
+class InferenceDispatcher:
+    """
+    Collects emotion-inference requests from many threads into shared batches.
+    A single worker thread waits for a request, keeps collecting for up to
+    window seconds or until max_batch_size inputs are queued, runs them through
+    run_batch in one go, and resolves each caller's future.
+    run_batch takes a list of token id lists and returns one result per input.
+    """
+    def __init__(self, run_batch, max_batch_size=32, window=0.005):
+        self.run_batch = run_batch
+        self.max_batch_size = max_batch_size
+        self.window = window
+        self._queue = queue.Queue()
+        self._thread = threading.Thread(target=self._worker, name="drama-dispatcher", daemon=True)
+        self._thread.start()
+
+    def submit(self, encoded):
+        """
+        Queues a request (a list of token id lists) and returns a Future of its results.
+        """
+        future = Future()
+        self._queue.put((list(encoded), future))
+        return future
+
+    def infer(self, encoded):
+        return self.submit(encoded).result()
+
+    def _collect(self):
+        requests = [self._queue.get()]
+        size = len(requests[0][0])
+        deadline = time.monotonic() + self.window
+        while size < self.max_batch_size:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            try:
+                request = self._queue.get(timeout=remaining)
+            except queue.Empty:
+                break
+            requests.append(request)
+            size += len(request[0])
+        return requests
+
+    def _worker(self):
+        while True:
+            requests = self._collect()
+            requests = [(encoded, future) for encoded, future in requests if future.set_running_or_notify_cancel()]
+            if not requests:
+                continue
+            inputs = [ids for encoded, _ in requests for ids in encoded]
+            try:
+                results = self.run_batch(inputs)
+            except BaseException as e:
+                # Any failure (even SystemExit / KeyboardInterrupt from run_batch) goes to
+                # the waiting callers; the worker keeps serving, or later submits would hang
+                for _, future in requests:
+                    future.set_exception(e)
+                continue
+            offset = 0
+            for encoded, future in requests:
+                future.set_result(results[offset:offset + len(encoded)])
+                offset += len(encoded)
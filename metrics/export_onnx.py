@@ -0,0 +1,11 @@
+import sys
+from .backends import export_onnx, ONNX_DIR
+from .metrics import MODEL_NAME
+
+# One-time export of the emotion model for the onnx / onnx-int8 backends.
+# Usage: python -m metrics.export_onnx [output_dir]
+
+if __name__ == "__main__":
+    output_dir = sys.argv[1] if len(sys.argv) > 1 else ONNX_DIR
+    for path in export_onnx(MODEL_NAME, output_dir):
+        print(f"Wrote {path}")
@@ -0,0 +1,115 @@
+import os
+import re
+from collections import Counter
+from functools import lru_cache
+
+# Lexicon matching for narrative_intensity.
+# Lexicons are plain text files (one term or multi-word phrase per line, optional
+# tab-separated weight, # comments). Every category is counted in one scan:
+# the text is split and counted once at C speed, then only its distinct tokens
+# are resolved (punctuation stripped) against a precompiled term table.
+# Multi-word phrases are found with one compiled regex over just the phrases.
+
+NON_WORD = re.compile(r"[^\w]+")
+
+LEXICON_DIR = os.getenv("DRAMA_LEXICON_DIR", os.path.join(os.path.dirname(__file__), "lexicons"))
+
+def normalize_term(term):
+    return " ".join(term.lower().split())
+
+def match_key(term):
+    """
+    Key a term or matched text is looked up by: lowercased words with any
+    punctuation between them collapsed to one space ("In-your-face" -> "in your face").
+    """
+    return " ".join(word for word in NON_WORD.split(term.lower()) if word)
+
+def load_lexicon(path):
+    """
+    Reads a lexicon file into {normalized term: weight}.
+    """
+    terms = {}
+    with open(path, "r", encoding="utf-8") as f:
+        for line in f:
+            line = line.split("#", 1)[0].strip()
+            if not line:
+                continue
+            parts = line.split("\t")
+            term = normalize_term(parts[0])
+            weight = float(parts[1]) if len(parts) > 1 and parts[1].strip() else 1.0
+            if term:
+                terms[term] = weight
+    return terms
+
+class LexiconMatcher:
+    """
+    Counts weighted matches for every lexicon category in one scan of the text.
+    Terms match whole words regardless of surrounding punctuation. Phrases
+    (including terms with inner punctuation, like "can't" or "in-your-face")
+    match across any run of whitespace or punctuation and take precedence over
+    the single terms they contain.
+    """
+    def __init__(self, lexicons):
+        self.lexicons = lexicons
+        self.categories = list(lexicons)
+        # match_key(term) -> [(category, weight), ...]; the phrase regex finds text with the same key
+        self._table = {}
+        for category, terms in lexicons.items():
+            for term, weight in terms.items():
+                key = match_key(term)
+                if key:
+                    self._table.setdefault(key, []).append((category, weight))
+
+        self._phrases = [term for term in self._table if " " in term]
+        self._phrase_regex = None
+        if self._phrases:
+            # Longest phrases first so they win over phrases they contain
+            alternatives = [
+                NON_WORD.pattern.join(re.escape(word) for word in term.split())
+                for term in sorted(self._phrases, key=len, reverse=True)
+            ]
+            self._phrase_regex = re.compile(r"(?<!\w)(?:" + "|".join(alternatives) + r")(?!\w)", re.IGNORECASE)
+        self._resolve = lru_cache(maxsize=65536)(self._resolve_token)
+
+    def _resolve_token(self, token):
+        # Single-word hits for one whitespace-delimited token, e.g. "war-torn," -> war, torn
+        hits = self._table.get(token)
+        if hits is not None:
+            return tuple(hits)
+        found = []
+        for piece in NON_WORD.split(token):
+            if piece:
+                found.extend(self._table.get(piece, ()))
+        return tuple(found)
+
+    @classmethod
+    def from_dir(cls, directory=LEXICON_DIR):
+        """
+        Loads every <category>.txt file in directory as a lexicon category.
+        """
+        lexicons = {}
+        for name in sorted(os.listdir(directory)):
+            if name.endswith(".txt"):
+                lexicons[name[:-4]] = load_lexicon(os.path.join(directory, name))
+        return cls(lexicons)
+
+    def count(self, text):
+        """
+        Returns {category: weighted match count} for text.
+        """
+        counts = dict.fromkeys(self.categories, 0.0)
+        lowered = text.lower()
+        for token, n in Counter(lowered.split()).items():
+            for category, weight in self._resolve(token):
+                counts[category] += weight * n
+
+        if self._phrase_regex is not None:
+            for match in self._phrase_regex.finditer(lowered):
+                phrase = match_key(match.group())
+                for category, weight in self._table.get(phrase, ()):
+                    counts[category] += weight
+                # A phrase counts instead of the single terms it contains
+                for word in phrase.split():
+                    for category, weight in self._table.get(word, ()):
+                        counts[category] -= weight
+        return counts
@@ -1,14 +1,41 @@
-import torch
+import asyncio
+import os
+import threading
 import numpy as np
-from transformers import AutoTokenizer, AutoModelForSequenceClassification
+from transformers import AutoTokenizer
+from .backends import load_backend
+from .dispatcher import InferenceDispatcher
+from .pool import InferencePool
+from .lexicon import LexiconMatcher
 
 print("metrics.py imports finished")
 
-# Load pretrained emotion model
+# Pretrained emotion model (the weights are loaded by the inference backend)
 MODEL_NAME = "j-hartmann/emotion-english-distilroberta-base"
 tokenizer = AutoTokenizer.from_pretrained(MODEL_NAME)
-model = AutoModelForSequenceClassification.from_pretrained(MODEL_NAME, use_safetensors=True)
-model.eval()
+
+# Inference backend: torch, onnx or onnx-int8 (see metrics/backends.py)
+BACKEND = os.getenv("DRAMA_BACKEND", "torch")
+# DRAMA_WORKERS > 0 runs the backend in that many worker processes (see metrics/pool.py)
+WORKERS = int(os.getenv("DRAMA_WORKERS", "0"))
+# Intra-op thread budget per backend copy; defaults to cores / DRAMA_WORKERS in the pool
+THREADS = int(os.getenv("DRAMA_THREADS", "0")) or None
+_backends = {}
+_backends_lock = threading.Lock()
+
+def get_backend(name=None):
+    """
+    Returns the loaded inference backend, loading it on first use.
+    With DRAMA_WORKERS set this is a process pool running the backend.
+    """
+    name = name or BACKEND
+    with _backends_lock:
+        if name not in _backends:
+            if WORKERS > 0:
+                _backends[name] = InferencePool(name, MODEL_NAME, WORKERS, THREADS)
+            else:
+                _backends[name] = load_backend(name, MODEL_NAME, THREADS)
+        return _backends[name]
 
 EMOTIONS = ["anger", "disgust", "fear", "joy", "neutral", "sadness", "surprise"]
 EMOTION_WEIGHTS = {
@@ -20,43 +47,245 @@ EMOTION_WEIGHTS = {
     "joy": 0.6,
     "neutral": 0.0
 }
-POWER_WORDS = {
-    "crisis","collapse","destroy","disaster","radical","chaos",
-    "emergency","war","threat","ruin","breakdown","catastrophe",
-    "devastating","apocalypse","terror","violent","extreme",
-    "corrupt","evil","outrage","attack","invasion","fuck","bad","horrendous","terrible","unjustified"
-}
-ABSOLUTIST = {"everything","nothing","always","never","all","none","everyone","nobody","everytime","rarely"}
+# Lexicons live in metrics/lexicons/ (power_words.txt, absolutist.txt)
+LEXICON = LexiconMatcher.from_dir()
+POWER_WORDS = set(LEXICON.lexicons.get("power_words", {}))
+ABSOLUTIST = set(LEXICON.lexicons.get("absolutist", {}))
+
+MAX_LENGTH = 512
+# Texts per forward pass in batched inference
+BATCH_SIZE = int(os.getenv("DRAMA_BATCH_SIZE", "16"))
+# Long documents are scored as overlapping token windows instead of being truncated to MAX_LENGTH
+WINDOWED = os.getenv("DRAMA_WINDOWED", "1") == "1"
+WINDOW_OVERLAP = int(os.getenv("DRAMA_WINDOW_OVERLAP", "64"))
+WINDOW_PERCENTILE = float(os.getenv("DRAMA_WINDOW_PERCENTILE", "90"))
+# Micro-batch concurrent requests: wait up to DRAMA_BATCH_WINDOW_MS for more work, up to DRAMA_MAX_BATCH inputs
+DISPATCHER = os.getenv("DRAMA_DISPATCHER", "1") == "1"
+BATCH_WINDOW = float(os.getenv("DRAMA_BATCH_WINDOW_MS", "5")) / 1000
+MAX_BATCH = int(os.getenv("DRAMA_MAX_BATCH", "32"))
+_dispatcher = None
+_dispatcher_lock = threading.Lock()
+
+def get_dispatcher():
+    """
+    Returns the shared micro-batching dispatcher, starting it on first use.
+    """
+    global _dispatcher
+    with _dispatcher_lock:
+        if _dispatcher is None:
+            _dispatcher = InferenceDispatcher(
+                # A full dispatch is one forward pass; only oversized dispatches are split
+                lambda encoded: _emotion_probs_encoded(encoded, MAX_BATCH, get_backend()),
+                max_batch_size=MAX_BATCH,
+                window=BATCH_WINDOW
+            )
+        return _dispatcher
+
+def _softmax(logits):
+    exp = np.exp(logits - logits.max(axis=-1, keepdims=True))
+    return exp / exp.sum(axis=-1, keepdims=True)
+
+def _emotion_probs_encoded(encoded, batch_size=None, backend=None):
+    """
+    Runs already-tokenized inputs (lists of token ids) through the model.
+    Inputs are sorted by length and padded per mini-batch, so short texts
+    aren't padded up to the longest one in the whole request.
+    Returns one probability array per input, in input order.
+    Without an explicit backend or batch size, requests go through the shared
+    dispatcher (when enabled) so concurrent callers share forward passes.
+    """
+    if backend is None and batch_size is None and DISPATCHER:
+        return get_dispatcher().infer(encoded)
+    batch_size = batch_size or BATCH_SIZE
+    backend = backend or get_backend()
+    results = [None] * len(encoded)
+    order = sorted(range(len(encoded)), key=lambda i: len(encoded[i]))
+    chunks = [order[start:start + batch_size] for start in range(0, len(order), batch_size)]
+    batches = []
+    for indices in chunks:
+        inputs = tokenizer.pad({"input_ids": [encoded[i] for i in indices]}, return_tensors="np")
+        batches.append((inputs["input_ids"], inputs["attention_mask"]))
+    # A process pool runs the mini-batches in parallel, one per worker
+    if hasattr(backend, "logits_many"):
+        all_logits = backend.logits_many(batches)
+    else:
+        all_logits = [backend.logits(input_ids, attention_mask) for input_ids, attention_mask in batches]
+    for indices, logits in zip(chunks, all_logits):
+        probs = _softmax(logits)
+        for row, i in enumerate(indices):
+            results[i] = probs[row]
+    return results
+
+def _emotion_probs_batch(texts, batch_size=None, backend=None):
+    if not texts:
+        return []
+    encoded = tokenizer(list(texts), truncation=True, max_length=MAX_LENGTH)["input_ids"]
+    return [dict(zip(EMOTIONS, probs)) for probs in _emotion_probs_encoded(encoded, batch_size, backend)]
 
 def _emotion_probs(text):
-    inputs = tokenizer(
-        text,
-        return_tensors="pt",
-        truncation=True,
-        padding=True,
-        max_length=512
-    )
-    with torch.no_grad():
-        logits = model(**inputs).logits
-    probs = torch.softmax(logits, dim=-1).cpu().numpy()[0]
-    return dict(zip(EMOTIONS, probs))
+    return _emotion_probs_batch([text])[0]
 
 def narrative_intensity(text): # 0-1
-    words = text.lower().split()
-    n = max(1, len(words))
+    n = max(1, len(text.split()))
 
-    power = sum(1 for w in words if w.strip(".,!?") in POWER_WORDS)
-    absolute = sum(1 for w in words if w.strip(".,!?") in ABSOLUTIST)
+    counts = LEXICON.count(text)
+    power = counts.get("power_words", 0)
+    absolute = counts.get("absolutist", 0)
 
     score = 2 * (power * 2 + absolute) / n
     return min(1.0, score * 4)
 
-def get_drama_index(text):
+def get_drama_index(text, windowed=None):
     """
     Returns Drama Index from 1 to 100 for any article or speech
     Higher = more emotionally intense or manipulative
+    With windowed mode on (the default), text longer than the model's limit is
+    scored over its full length instead of just the first MAX_LENGTH tokens.
+    """
+    windowed = WINDOWED if windowed is None else windowed
+    if windowed:
+        result = get_drama_index_windowed(text)
+        return [result["score"], result["emotions"]]
+    return _drama_index_from_emotions(text, _emotion_probs(text))
+
+def _split_windows(text, overlap=None):
+    """
+    Splits text into overlapping token windows that each fit the model.
+    Returns (input_ids with special tokens, window text) pairs.
+    """
+    overlap = WINDOW_OVERLAP if overlap is None else overlap
+    encoding = tokenizer(text, add_special_tokens=False, return_offsets_mapping=True)
+    ids, offsets = encoding["input_ids"], encoding["offset_mapping"]
+    size = MAX_LENGTH - tokenizer.num_special_tokens_to_add()
+    step = max(1, size - max(0, overlap))
+
+    windows = []
+    for start in range(0, max(1, len(ids)), step):
+        chunk = ids[start:start + size]
+        window_text = text[offsets[start][0]:offsets[start + len(chunk) - 1][1]] if chunk else text
+        windows.append((tokenizer.build_inputs_with_special_tokens(chunk), window_text))
+        if start + size >= len(ids):
+            break
+    return windows
+
+def _window_probs(texts, overlap=None, batch_size=None, backend=None):
+    """
+    Splits every text into windows and runs all of them in one batched pass.
+    Returns (windows, probs) per text.
     """
-    emotions = _emotion_probs(text)
+    split = [_split_windows(text, overlap) for text in texts]
+    probs = _emotion_probs_encoded([ids for windows in split for ids, _ in windows], batch_size, backend)
+    results, start = [], 0
+    for windows in split:
+        results.append((windows, probs[start:start + len(windows)]))
+        start += len(windows)
+    return results
+
+def _windowed_score(text, windows, probs):
+    # Drama index of the length-weighted mean emotion distribution over the windows
+    weights = np.array([len(ids) for ids, _ in windows], dtype=np.float64)
+    mean_probs = np.average(np.stack(probs), axis=0, weights=weights)
+    return _drama_index_from_emotions(text, dict(zip(EMOTIONS, mean_probs)))
+
+def get_drama_index_windowed(text, overlap=None, percentile=None, batch_size=None):
+    """
+    Scores the whole document as overlapping token windows run in batches.
+    Returns a dict with:
+    - score / emotions: drama index of the length-weighted mean emotion distribution
+    - max / percentile: highest and percentile (default 90th) per-window score
+    - windows: per-window score, emotions and text span
+    Cost grows linearly with document length.
+    """
+    percentile = WINDOW_PERCENTILE if percentile is None else percentile
+    [(windows, probs)] = _window_probs([text], overlap, batch_size)
+    score, emotions100 = _windowed_score(text, windows, probs)
+
+    window_results = []
+    for (ids, window_text), window_probs in zip(windows, probs):
+        window_score, window_emotions = _drama_index_from_emotions(window_text, dict(zip(EMOTIONS, window_probs)))
+        window_results.append({
+            "score": window_score,
+            "emotions": window_emotions,
+            "tokens": len(ids),
+            "text": window_text,
+        })
+    window_scores = [w["score"] for w in window_results]
+
+    return {
+        "score": score,
+        "emotions": emotions100,
+        "max": max(window_scores),
+        "percentile": int(round(np.percentile(window_scores, percentile))),
+        "windows": window_results,
+    }
+
+def get_drama_index_batch(texts, batch_size=None, backend=None, windowed=None):
+    """
+    Batched get_drama_index: runs all texts through the model in length-sorted,
+    dynamically padded mini-batches and returns one [score, emotions100] per text.
+    Scores match get_drama_index: with windowed mode on, long texts are split
+    into windows (all texts' windows share the batches) instead of truncated.
+    backend overrides the configured inference backend (a name or a loaded backend).
+    """
+    texts = list(texts)
+    windowed = WINDOWED if windowed is None else windowed
+    if isinstance(backend, str):
+        backend = get_backend(backend)
+    if not texts:
+        return []
+    if windowed:
+        return [_windowed_score(text, windows, probs)
+                for text, (windows, probs) in zip(texts, _window_probs(texts, batch_size=batch_size, backend=backend))]
+    return [_drama_index_from_emotions(text, emotions)
+            for text, emotions in zip(texts, _emotion_probs_batch(texts, batch_size, backend))]
+
+def get_paragraph_drama(texts, batch_size=None, text=None, windowed=None):
+    """
+    Per-paragraph drama index and the article's, from one batched inference over
+    the paragraphs. The article score is the drama index of the length-weighted
+    mean emotion distribution of everything that pass scored (text, defaulting to
+    the joined paragraphs, feeds the lexicon part).
+    With windowed mode on, a paragraph longer than the model's limit is scored as
+    overlapping token windows, so the whole article counts; otherwise each
+    paragraph is truncated to MAX_LENGTH tokens.
+    Returns {"paragraphs": [[score, emotions100], ...], "article": [score, emotions100]}.
+    """
+    texts = list(texts)
+    windowed = WINDOWED if windowed is None else windowed
+    text = "\n".join(texts) if text is None else text
+    if not texts:
+        return {"paragraphs": [], "article": _drama_index_from_emotions("", dict.fromkeys(EMOTIONS, 0.0))}
+
+    if windowed:
+        per_paragraph = _window_probs(texts, batch_size=batch_size)
+    else:
+        encoded = tokenizer(texts, truncation=True, max_length=MAX_LENGTH)["input_ids"]
+        probs = _emotion_probs_encoded(encoded, batch_size)
+        # One "window" per paragraph: its truncated input
+        per_paragraph = [([(ids, paragraph)], [p]) for ids, paragraph, p in zip(encoded, texts, probs)]
+
+    paragraphs = [_windowed_score(paragraph, windows, probs)
+                  for paragraph, (windows, probs) in zip(texts, per_paragraph)]
+    article = _windowed_score(
+        text,
+        [window for windows, _ in per_paragraph for window in windows],
+        [p for _, probs in per_paragraph for p in probs]
+    )
+
+    return {"paragraphs": paragraphs, "article": article}
+
+def score_paragraphs(paragraphs, batch_size=None, text=None):
+    """
+    Sets drama_index and emotions on each paragraph (anything with a .text)
+    and returns the article's [score, emotions100] (see get_paragraph_drama).
+    """
+    result = get_paragraph_drama([p.text for p in paragraphs], batch_size, text)
+    for paragraph, (score, emotions) in zip(paragraphs, result["paragraphs"]):
+        paragraph.drama_index = score
+        paragraph.emotions = emotions
+    return result["article"]
+
+def _drama_index_from_emotions(text, emotions):
     emotions100 = {}
     for k in emotions:
         emotions100[k] = int(emotions[k] * 100)
@@ -70,6 +299,12 @@ def get_drama_index(text):
 
     return [min(100, max(1, min(100, final)) * 2), emotions100]
 
+async def get_drama_index_async(text):
+    """
+    Async version of get_drama_index; inference runs in a worker thread so the event loop stays free
+    """
+    return await asyncio.to_thread(get_drama_index, text)
+
 if __name__ == "__main__":
     tests = [
         "The economy is collapsing and families are in crisis as radical policies destroy everything.",
@@ -0,0 +1,85 @@
+import atexit
+import multiprocessing
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from . import pool_worker
+
+# Process-level inference pool for the emotion model.
+# Each worker process loads its own copy of the backend with a fixed intra-op
+# thread budget, so workers x threads never exceeds the cores we were given and
+# concurrent Flask threads don't fight over one torch thread pool.
+# Workers are started with "spawn": forking a process that already has torch's
+# thread pool running can deadlock. A spawned worker re-imports the parent's
+# main module (kept trivial, see main.py) before running anything of ours, so
+# OpenMP / MKL thread caps are passed through the environment it starts with
+# rather than set inside it.
+
+THREAD_ENV_VARS = ("OMP_NUM_THREADS", "MKL_NUM_THREADS")
+# Serializes the environment swap while workers are being spawned
+_spawn_lock = threading.Lock()
+
+def default_threads(workers):
+    return max(1, (os.cpu_count() or 1) // max(1, workers))
+
+class InferencePool:
+    """
+    Runs backend.logits in a pool of worker processes.
+    Each of the workers loads backend_name with a torch/ONNX Runtime thread
+    budget of threads (default: cores split evenly across workers).
+    Behaves like a backend, plus logits_many to spread mini-batches over workers.
+    """
+    def __init__(self, backend_name, model_name, workers=2, threads=None):
+        self.name = f"{backend_name} x{workers}"
+        self.workers = workers
+        self.threads = threads or default_threads(workers)
+        self._executor = ProcessPoolExecutor(
+            max_workers=workers,
+            mp_context=multiprocessing.get_context("spawn"),
+            initializer=pool_worker.init_worker,
+            initargs=(backend_name, model_name, self.threads)
+        )
+        atexit.register(self.shutdown)
+        self._start_workers()
+
+    def _start_workers(self):
+        # The executor spawns a worker per submit while none is idle, so one task
+        # per worker starts them all now, while the thread caps are in the environment
+        with _spawn_lock:
+            saved = {name: os.environ.get(name) for name in THREAD_ENV_VARS}
+            os.environ.update(dict.fromkeys(THREAD_ENV_VARS, str(self.threads)))
+            try:
+                futures = [self._executor.submit(pool_worker.ready) for _ in range(self.workers)]
+            finally:
+                for name, value in saved.items():
+                    if value is None:
+                        os.environ.pop(name, None)
+                    else:
+                        os.environ[name] = value
+        # Surfaces backend load errors (BrokenProcessPool) here rather than on first use
+        for future in futures:
+            future.result()
+
+    def logits(self, input_ids, attention_mask):
+        return self._executor.submit(pool_worker.logits, input_ids, attention_mask).result()
+
+    def logits_many(self, batches):
+        """
+        Runs (input_ids, attention_mask) batches across the workers in parallel.
+        Returns one logits array per batch, in order.
+        """
+        futures = [self._executor.submit(pool_worker.logits, input_ids, attention_mask)
+                   for input_ids, attention_mask in batches]
+        return [future.result() for future in futures]
+
+    def warm_up(self):
+        """
+        Sends one tiny batch per worker so models are loaded before real traffic.
+        """
+        import numpy as np
+
+        ids = np.ones((1, 4), dtype=np.int64)
+        self.logits_many([(ids, ids)] * self.workers)
+
+    def shutdown(self):
+        self._executor.shutdown(wait=False, cancel_futures=True)
@@ -0,0 +1,24 @@
+from .backends import load_backend
+
+# Code that runs inside InferencePool worker processes (see metrics/pool.py).
+# It only needs the backends: unpickling these functions in a worker must not
+# pull in metrics.metrics (tokenizer, lexicons) or the Gemini client.
+
+_backend = None
+
+def init_worker(backend_name, model_name, threads):
+    global _backend
+    if backend_name == "torch":
+        import torch
+        try:
+            torch.set_num_interop_threads(1)
+        except RuntimeError:
+            # Already set once this process ran torch work
+            pass
+    _backend = load_backend(backend_name, model_name, threads)
+
+def ready():
+    return True
+
+def logits(input_ids, attention_mask):
+    return _backend.logits(input_ids, attention_mask)
@@ -0,0 +1,48 @@
+import sys
+import time
+from urllib.parse import urlparse
+from .outlet_bias import get_dataset, normalize_host, lookup_host
+
+# Outlet lookups/sec: the domain index against the old substring scan over every outlet.
+# Usage: python -m outlet_bias.benchmark [lookups]
+
+SAMPLE_URLS = [
+    "https://www.cnn.com/2024/01/01/politics/story/index.html",
+    "https://edition.cnn.com/world/live-news",
+    "https://abcnews.go.com/Politics/story?id=1",
+    "https://m.foxnews.com/politics/article",
+    "https://amp.theguardian.com/uk-news/2024/jan/01/story",
+    "https://www.telegraph.co.uk/news/2024/01/01/story/",
+    "https://uk.reuters.com/article/idUK123",
+    "https://nypost.com/2024/01/01/news/story/",
+    "https://www.example.com/not-an-outlet",
+    "https://go.com/",
+]
+
+def legacy_lookup(url):
+    domain = urlparse(url).netloc.replace("www.", "").lower()
+    for outlet in get_dataset()[0]:
+        if domain in (outlet["url"] or "").lower():
+            return outlet
+    return None
+
+def indexed_lookup(url):
+    host = normalize_host(url)
+    return lookup_host(host) if host else None
+
+def rate(fn, lookups):
+    start = time.perf_counter()
+    for i in range(lookups):
+        fn(SAMPLE_URLS[i % len(SAMPLE_URLS)])
+    return lookups / (time.perf_counter() - start)
+
+if __name__ == "__main__":
+    lookups = int(sys.argv[1]) if len(sys.argv) > 1 else 2000
+
+    for url in SAMPLE_URLS:
+        legacy, indexed = legacy_lookup(url), indexed_lookup(url)
+        name = lambda record: record["news_source"] if record else None
+        print(f"{url:60} legacy={name(legacy)!s:20} index={name(indexed)}")
+
+    print(f"legacy scan: {rate(legacy_lookup, lookups):10.0f} lookups/s")
+    print(f"index:       {rate(indexed_lookup, lookups * 100):10.0f} lookups/s")
@@ -0,0 +1,81 @@
+import csv
+import hashlib
+import json
+import os
+import re
+import sys
+from .outlet_bias import DATASET_PATH, DATASET_VERSION, build_domain_index
+
+# Builds outlets.json from the raw AllSides ratings and the sites list in one step:
+#   1. pull the twitter handle out of each AllSides twitter URL
+#   2. inner-join AllSides rows with sites_with_url.csv on that handle
+#   3. keep only the fields NewsOutlet needs and index outlets by host
+# The output is deterministic (no timestamps, sorted keys), so rebuilding from
+# the same inputs gives a byte-identical file.
+# Usage: python -m outlet_bias.build [output_path]
+
+DATA_DIR = os.path.dirname(__file__)
+ALLSIDES_CSV = os.path.join(DATA_DIR, "allsides_data.csv")
+SITES_CSV = os.path.join(DATA_DIR, "sites_with_url.csv")
+
+# Opinion desks share their newsroom's domain and would shadow it in the
+# first-wins host index (these rows were blanked by hand in the old merged CSV)
+EXCLUDED_SOURCES = {"CNN - Editorial", "Fox News Opinion", "NPR Editorial"}
+
+def extract_twitter_handle(url):
+    if not isinstance(url, str):
+        return None
+    match = re.search(r'twitter\.com/@?([a-zA-Z0-9_]+)', url)
+    out = match.group(1) if match else None
+    return out.lower() if out else None
+
+def read_csv(path):
+    with open(path, newline="", encoding="utf-8") as f:
+        return list(csv.DictReader(f))
+
+def file_sha256(path):
+    with open(path, "rb") as f:
+        return hashlib.sha256(f.read()).hexdigest()
+
+def merge_outlets(allsides_rows, site_rows):
+    """
+    Joins AllSides ratings to outlet homepages by twitter handle, keeping AllSides order.
+    """
+    sites = {}
+    for row in site_rows:
+        sites.setdefault(row["twitter"], []).append(row)
+
+    outlets = []
+    for row in allsides_rows:
+        handle = extract_twitter_handle(row["twitter"])
+        if not handle or row["news_source"] in EXCLUDED_SOURCES:
+            continue
+        for site in sites.get(handle, []):
+            outlets.append({
+                "news_source": row["news_source"] or None,
+                "rating": row["rating"] or None,
+                "twitter": handle,
+                "url": site["url"] or None,
+            })
+    return outlets
+
+def build(output_path=DATASET_PATH, allsides_csv=ALLSIDES_CSV, sites_csv=SITES_CSV):
+    """
+    Writes the outlet artifact and returns it.
+    """
+    outlets = merge_outlets(read_csv(allsides_csv), read_csv(sites_csv))
+    dataset = {
+        "version": DATASET_VERSION,
+        "sources": {os.path.basename(path): file_sha256(path) for path in (allsides_csv, sites_csv)},
+        "outlets": outlets,
+        "domains": build_domain_index(outlets),
+    }
+    with open(output_path, "w", encoding="utf-8") as f:
+        json.dump(dataset, f, sort_keys=True, separators=(",", ":"))
+        f.write("\n")
+    return dataset
+
+if __name__ == "__main__":
+    output_path = sys.argv[1] if len(sys.argv) > 1 else DATASET_PATH
+    dataset = build(output_path)
+    print(f"Wrote {len(dataset['outlets'])} outlets ({len(dataset['domains'])} hosts) to {output_path}")
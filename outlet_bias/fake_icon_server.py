@@ -0,0 +1,101 @@
+import hashlib
+import re
+import sys
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+# Minimal local stand-in for the favicon service, for exercising outlet_bias.favicons
+# (concurrency, ETag revalidation, failures) without touching the real one.
+# Point the fetcher at it with FAVICON_SOURCE=http://127.0.0.1:<port>/ip3/{domain}.ico.
+# Unknown domains get a generated icon unless strict=True.
+# Usage: python -m outlet_bias.fake_icon_server [port]
+
+ICON_PATH = re.compile(r"^/ip3/(?P<domain>[^/]+)\.ico$")
+
+def default_icon(domain):
+    return b"\x00\x00\x01\x00" + domain.encode("utf-8")
+
+class FakeIconServer:
+    """
+    Threaded HTTP server answering GET /ip3/<domain>.ico with an ETag per icon
+    and 304 for matching If-None-Match. Every request is recorded as
+    (domain, status) in requests.
+    """
+    def __init__(self, port=0, icons=None, strict=False):
+        self.icons = dict(icons or {})
+        self.strict = strict
+        self.requests = []
+        self._lock = threading.Lock()
+        self.httpd = ThreadingHTTPServer(("127.0.0.1", port), self._handler())
+        self._thread = None
+
+    @property
+    def endpoint(self):
+        host, port = self.httpd.server_address[:2]
+        return f"http://{host}:{port}"
+
+    @property
+    def source(self):
+        return self.endpoint + "/ip3/{domain}.ico"
+
+    def set_icon(self, domain, content):
+        with self._lock:
+            self.icons[domain] = content
+
+    def start(self):
+        self._thread = threading.Thread(target=self.httpd.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+    def _icon(self, domain):
+        with self._lock:
+            if domain in self.icons:
+                return self.icons[domain]
+        return None if self.strict else default_icon(domain)
+
+    def _handler(self):
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def _send(self, status, body=b"", headers=None):
+                self.send_response(status)
+                for name, value in (headers or {}).items():
+                    self.send_header(name, value)
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def do_GET(self):
+                match = ICON_PATH.match(self.path)
+                domain = match.group("domain") if match else None
+                content = server._icon(domain) if domain else None
+                if content is None:
+                    status = 404
+                    self._send(status)
+                else:
+                    etag = '"' + hashlib.sha256(content).hexdigest()[:16] + '"'
+                    if self.headers.get("If-None-Match") == etag:
+                        status = 304
+                        self._send(status, headers={"ETag": etag})
+                    else:
+                        status = 200
+                        self._send(status, content, {"ETag": etag, "Content-Type": "image/x-icon"})
+                with server._lock:
+                    server.requests.append((domain, status))
+
+            def log_message(self, format, *args):
+                pass
+
+        return Handler
+
+if __name__ == "__main__":
+    port = int(sys.argv[1]) if len(sys.argv) > 1 else 8766
+    fake = FakeIconServer(port)
+    print(f"Fake favicon service listening on {fake.source}")
+    fake.httpd.serve_forever()
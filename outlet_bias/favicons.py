@@ -0,0 +1,193 @@
+import hashlib
+import json
+import os
+import sys
+import threading
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import urlparse
+import requests
+from requests.adapters import HTTPAdapter
+from .outlet_bias import get_dataset, normalize_host
+
+# Refreshes outlet_bias/favicons/<twitter>.ico for every outlet in outlets.json.
+# Icons are fetched concurrently over one pooled session, with a cap on
+# in-flight requests per host. Responses land in a content-addressed cache
+# (objects/<sha256>) whose index keeps each URL's ETag / Last-Modified, so a
+# rebuild sends conditional requests and only transfers icons that changed.
+# FAVICON_SOURCE can point at a local stand-in (see outlet_bias/fake_icon_server.py).
+# Usage: python -m outlet_bias.favicons
+
+DATA_DIR = os.path.dirname(__file__)
+FAVICON_DIR = os.path.join(DATA_DIR, "favicons")
+FAVICON_SOURCE = os.getenv("FAVICON_SOURCE", "https://icons.duckduckgo.com/ip3/{domain}.ico")
+FAVICON_CACHE_DIR = os.getenv("FAVICON_CACHE_DIR", os.path.join(DATA_DIR, "favicon_cache"))
+FAVICON_WORKERS = int(os.getenv("FAVICON_WORKERS", "8"))
+FAVICON_PER_HOST = int(os.getenv("FAVICON_PER_HOST", "4"))
+FAVICON_TIMEOUT = float(os.getenv("FAVICON_TIMEOUT", "5"))
+
+def content_hash(content):
+    return hashlib.sha256(content).hexdigest()
+
+def _write_atomic(path, data):
+    tmp_path = f"{path}.{threading.get_ident()}.tmp"
+    with open(tmp_path, "wb") as f:
+        f.write(data)
+    os.replace(tmp_path, path)
+
+class FaviconCache:
+    """
+    Content-addressed favicon store. Bodies live in objects/<sha256>;
+    index.json maps each source URL to its hash and HTTP validators.
+    """
+    def __init__(self, root=FAVICON_CACHE_DIR):
+        self.root = root
+        self.index_path = os.path.join(root, "index.json")
+        os.makedirs(os.path.join(root, "objects"), exist_ok=True)
+        self._lock = threading.Lock()
+        try:
+            with open(self.index_path, encoding="utf-8") as f:
+                self._index = json.load(f)
+        except (FileNotFoundError, json.JSONDecodeError):
+            self._index = {}
+
+    def object_path(self, sha256):
+        return os.path.join(self.root, "objects", sha256)
+
+    def get(self, url):
+        """
+        Returns the cached entry for url, or None when missing or its object is gone.
+        """
+        with self._lock:
+            entry = self._index.get(url)
+        if entry and os.path.exists(self.object_path(entry["sha256"])):
+            return entry
+        return None
+
+    def put(self, url, content, etag=None, last_modified=None):
+        sha256 = content_hash(content)
+        path = self.object_path(sha256)
+        if not os.path.exists(path):
+            _write_atomic(path, content)
+        with self._lock:
+            self._index[url] = {"sha256": sha256, "etag": etag, "last_modified": last_modified}
+        return sha256
+
+    def save(self):
+        with self._lock:
+            data = json.dumps(self._index, sort_keys=True, indent=1).encode("utf-8")
+        _write_atomic(self.index_path, data)
+
+class FaviconFetcher:
+    """
+    Fetches favicons through one pooled requests session with at most workers
+    requests in flight overall and per_host to any single host.
+    fetch() returns (sha256 or None, status) where status is
+    "downloaded", "not-modified" or "failed".
+    """
+    def __init__(self, cache=None, source=FAVICON_SOURCE, workers=FAVICON_WORKERS,
+                 per_host=FAVICON_PER_HOST, timeout=FAVICON_TIMEOUT):
+        self.cache = cache or FaviconCache()
+        self.source = source
+        self.workers = workers
+        self.per_host = per_host
+        self.timeout = timeout
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=workers, pool_maxsize=workers)
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+        self._host_limits = {}
+        self._host_lock = threading.Lock()
+
+    def _host_limit(self, url):
+        host = urlparse(url).netloc
+        with self._host_lock:
+            if host not in self._host_limits:
+                self._host_limits[host] = threading.Semaphore(self.per_host)
+            return self._host_limits[host]
+
+    def fetch(self, domain):
+        url = self.source.format(domain=domain)
+        cached = self.cache.get(url)
+        headers = {}
+        if cached and cached.get("etag"):
+            headers["If-None-Match"] = cached["etag"]
+        if cached and cached.get("last_modified"):
+            headers["If-Modified-Since"] = cached["last_modified"]
+
+        try:
+            with self._host_limit(url):
+                response = self.session.get(url, headers=headers, timeout=self.timeout)
+        except requests.RequestException as e:
+            print(f"Error downloading favicon for {domain}: {e}")
+            return (cached["sha256"] if cached else None), "failed"
+
+        if response.status_code == 304 and cached:
+            return cached["sha256"], "not-modified"
+        if response.status_code == 200 and response.content:
+            sha256 = self.cache.put(url, response.content,
+                                    response.headers.get("ETag"), response.headers.get("Last-Modified"))
+            return sha256, "downloaded"
+        print(f"Error downloading favicon for {domain}: HTTP {response.status_code}")
+        return (cached["sha256"] if cached else None), "failed"
+
+    def fetch_all(self, domains):
+        """
+        Fetches each distinct domain once, concurrently.
+        Returns {domain: (sha256 or None, status)}.
+        """
+        domains = list(dict.fromkeys(domains))
+        with ThreadPoolExecutor(max_workers=self.workers) as executor:
+            results = dict(zip(domains, executor.map(self.fetch, domains)))
+        self.cache.save()
+        return results
+
+    def close(self):
+        self.session.close()
+
+def sync_favicons(outlets=None, output_dir=FAVICON_DIR, fetcher=None):
+    """
+    Brings output_dir/<twitter>.ico up to date for every outlet with a homepage.
+    Files are only rewritten when their content changed.
+    Returns a Counter of fetch statuses plus "written" / "unchanged" files.
+    """
+    outlets = get_dataset()[0] if outlets is None else outlets
+    own_fetcher = fetcher is None
+    fetcher = fetcher or FaviconFetcher()
+    os.makedirs(output_dir, exist_ok=True)
+
+    targets = {}
+    for outlet in outlets:
+        if outlet.get("twitter") and outlet.get("url"):
+            domain = normalize_host(outlet["url"])
+            if domain:
+                targets.setdefault(outlet["twitter"], domain)
+
+    stats = Counter()
+    try:
+        results = fetcher.fetch_all(targets.values())
+    finally:
+        if own_fetcher:
+            fetcher.close()
+    for status in (status for _, status in results.values()):
+        stats[status] += 1
+
+    for handle, domain in targets.items():
+        sha256 = results[domain][0]
+        if sha256 is None:
+            continue
+        path = os.path.join(output_dir, f"{handle}.ico")
+        if os.path.exists(path):
+            with open(path, "rb") as f:
+                if content_hash(f.read()) == sha256:
+                    stats["unchanged"] += 1
+                    continue
+        with open(fetcher.cache.object_path(sha256), "rb") as f:
+            _write_atomic(path, f.read())
+        stats["written"] += 1
+    return stats
+
+if __name__ == "__main__":
+    output_dir = sys.argv[1] if len(sys.argv) > 1 else FAVICON_DIR
+    stats = sync_favicons(output_dir=output_dir)
+    print(", ".join(f"{count} {status}" for status, count in sorted(stats.items())))
@@ -1,8 +1,83 @@
+import json
 import os
-import pandas as pd
+import threading
+from urllib.parse import urlparse
 
-_csv_path = os.path.join(os.path.dirname(__file__), "merged_outlet_bias_data.csv")
-df = pd.read_csv(_csv_path)
+# Outlet data is a small prebuilt JSON artifact (see outlet_bias/build.py):
+# only the fields NewsOutlet needs plus a host -> outlet index, so workers
+# don't need pandas or a full DataFrame at runtime.
+# Rebuild it from the raw CSVs with: python -m outlet_bias.build
+DATASET_PATH = os.getenv("OUTLET_DATASET_PATH", os.path.join(os.path.dirname(__file__), "outlets.json"))
+DATASET_VERSION = 1
+
+# Prefixes that don't change which outlet a host belongs to
+HOST_PREFIXES = ("www.", "m.", "amp.", "mobile.")
+
+def normalize_host(url):
+    """
+    Lowercase host of a URL (or bare host) without port, trailing dot or www./m./amp. prefixes.
+    """
+    if "//" not in url:
+        url = "//" + url
+    host = (urlparse(url.strip()).hostname or "").rstrip(".")
+    while host.startswith(HOST_PREFIXES):
+        host = host.split(".", 1)[1]
+    return host
+
+def build_domain_index(records):
+    """
+    Maps each outlet's normalized host to its position in records. The first
+    record wins when several outlets share a host, like the old row scan did.
+    """
+    index = {}
+    for position, record in enumerate(records):
+        url = record.get("url")
+        if not isinstance(url, str) or not url.strip():
+            continue
+        host = normalize_host(url)
+        if host:
+            index.setdefault(host, position)
+    return index
+
+def load_dataset(path=DATASET_PATH):
+    """
+    Reads the prebuilt outlet artifact.
+    Returns (outlets, {host: outlet record}).
+    """
+    with open(path, encoding="utf-8") as f:
+        data = json.load(f)
+    if data.get("version") != DATASET_VERSION:
+        raise ValueError(f"{path} has dataset version {data.get('version')}, expected {DATASET_VERSION}; "
+                         "rebuild it with: python -m outlet_bias.build")
+    outlets = data["outlets"]
+    return outlets, {host: outlets[position] for host, position in data["domains"].items()}
+
+_dataset = None
+_dataset_lock = threading.Lock()
+
+def get_dataset():
+    """
+    Returns the loaded (outlets, domain index), reading the artifact on first use.
+    """
+    global _dataset
+    with _dataset_lock:
+        if _dataset is None:
+            _dataset = load_dataset()
+        return _dataset
+
+def lookup_host(host, index=None):
+    """
+    Finds the outlet record for a normalized host by trying it and then each
+    parent domain (edition.cnn.com -> cnn.com), down to two labels.
+    Cost is one dict lookup per label.
+    """
+    index = get_dataset()[1] if index is None else index
+    labels = host.split(".")
+    for start in range(max(1, len(labels) - 1)):
+        record = index.get(".".join(labels[start:]))
+        if record is not None:
+            return record
+    return None
 
 class NewsOutlet:
     def __init__(self, url):
@@ -12,17 +87,10 @@ class NewsOutlet:
         self.logo_url = f"https://mucube.github.io/news-outlet-favicons/favicons/{self._outlet_data.get('twitter')}.ico"
 
     def _find_outlet_by_url(self, url):
-        from urllib.parse import urlparse
-
-        parsed = urlparse(url)
-        domain = parsed.netloc.replace("www.", "")
-
-        matches = df[df["url_b"].str.contains(domain, case=False, na=False)]
-
-        if not matches.empty:
-            return matches.iloc[0].to_dict()
-
-        return None
+        host = normalize_host(url)
+        if not host:
+            return None
+        return lookup_host(host)
 
     def json(self):
         return {
@@ -1,4 +1,4 @@
-from .get_content import get_content
+from .get_content import get_content, get_contents
 from .search_content import search_urls
 
-__all__ = ["get_content", "search_urls"]
\ No newline at end of file
+__all__ = ["get_content", "get_contents", "search_urls"]
\ No newline at end of file
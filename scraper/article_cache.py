@@ -0,0 +1,173 @@
+import json
+import os
+import sqlite3
+import threading
+import time
+from concurrent.futures import Future
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
+
+# On-disk cache of fetched articles: raw HTML, its HTTP validators and the parsed
+# result, keyed by canonical URL. Fresh entries (younger than SCRAPER_CACHE_TTL
+# seconds) are served without touching the network; stale ones are revalidated
+# with If-None-Match / If-Modified-Since and only re-parsed when the page changed.
+
+CACHE_ENABLED = os.getenv("SCRAPER_CACHE_ENABLED", "1") == "1"
+CACHE_PATH = os.getenv("SCRAPER_CACHE_PATH", os.path.join(os.path.dirname(__file__), "article_cache.sqlite3"))
+CACHE_TTL = float(os.getenv("SCRAPER_CACHE_TTL", "900"))
+# Total size of cached HTML and results allowed before the least recently fetched are evicted
+CACHE_MAX_BYTES = int(os.getenv("SCRAPER_CACHE_MAX_BYTES", str(256 * 1024 * 1024)))
+
+# Query parameters that only track the click and never change the article
+TRACKING_PARAMS = {"fbclid", "gclid", "dclid", "mc_cid", "mc_eid", "igshid", "ref", "ref_src", "cmpid", "ocid"}
+
+def canonical_url(url):
+    """
+    Normalizes a URL so links to the same article share a cache entry:
+    lowercase scheme and host, no default port, fragment or utm_*/tracking
+    parameters, and sorted query parameters.
+    """
+    parts = urlsplit(url.strip())
+    scheme = (parts.scheme or "http").lower()
+    host = (parts.hostname or "").lower()
+    if parts.port and (scheme, parts.port) not in (("http", 80), ("https", 443)):
+        host = f"{host}:{parts.port}"
+    query = sorted(
+        (key, value) for key, value in parse_qsl(parts.query, keep_blank_values=True)
+        if not key.lower().startswith("utm_") and key.lower() not in TRACKING_PARAMS
+    )
+    return urlunsplit((scheme, host, parts.path or "/", urlencode(query), ""))
+
+class ArticleCache:
+    """
+    SQLite cache of article HTML, validators and parsed results by canonical URL.
+    """
+    def __init__(self, path=CACHE_PATH, ttl=CACHE_TTL, max_bytes=CACHE_MAX_BYTES):
+        self.path = path
+        self.ttl = ttl
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS articles ("
+            "url TEXT PRIMARY KEY, html BLOB NOT NULL, etag TEXT, last_modified TEXT, "
+            "result TEXT NOT NULL, size INTEGER NOT NULL, fetched_at REAL NOT NULL)"
+        )
+        self._conn.execute("CREATE INDEX IF NOT EXISTS articles_fetched_at ON articles (fetched_at)")
+        self._conn.commit()
+
+    def get(self, url):
+        """
+        Returns the entry for a canonical URL as a dict (html, etag, last_modified,
+        result, fetched_at, fresh), or None on a miss. html is the page as downloaded (bytes).
+        """
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT html, etag, last_modified, result, fetched_at FROM articles WHERE url = ?", (url,)
+            ).fetchone()
+        if row is None:
+            return None
+        html, etag, last_modified, result, fetched_at = row
+        return {
+            "html": html,
+            "etag": etag,
+            "last_modified": last_modified,
+            "result": json.loads(result),
+            "fetched_at": fetched_at,
+            "fresh": time.time() - fetched_at < self.ttl,
+        }
+
+    def set(self, url, html, result, etag=None, last_modified=None):
+        data = json.dumps(result)
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO articles (url, html, etag, last_modified, result, size, fetched_at) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (url, html, etag, last_modified, data, len(html) + len(data), time.time())
+            )
+            self._evict()
+            self._conn.commit()
+
+    def merge_result(self, url, fields):
+        """
+        Adds fields computed later (e.g. keywords and summary) to a cached result.
+        """
+        with self._lock:
+            row = self._conn.execute("SELECT result FROM articles WHERE url = ?", (url,)).fetchone()
+            if row is None:
+                return
+            result = json.loads(row[0])
+            result.update(fields)
+            data = json.dumps(result)
+            self._conn.execute(
+                "UPDATE articles SET result = ?, size = LENGTH(html) + ? WHERE url = ?", (data, len(data), url)
+            )
+            self._conn.commit()
+
+    def touch(self, url):
+        """
+        Marks an entry fresh again after the origin answered 304 Not Modified.
+        """
+        with self._lock:
+            self._conn.execute("UPDATE articles SET fetched_at = ? WHERE url = ?", (time.time(), url))
+            self._conn.commit()
+
+    def _evict(self):
+        total = self._conn.execute("SELECT COALESCE(SUM(size), 0) FROM articles").fetchone()[0]
+        if total <= self.max_bytes:
+            return
+        freed = 0
+        doomed = []
+        for url, size in self._conn.execute("SELECT url, size FROM articles ORDER BY fetched_at"):
+            doomed.append((url,))
+            freed += size
+            if total - freed <= self.max_bytes:
+                break
+        self._conn.executemany("DELETE FROM articles WHERE url = ?", doomed)
+
+    def clear(self):
+        with self._lock:
+            self._conn.execute("DELETE FROM articles")
+            self._conn.commit()
+
+class SingleFlight:
+    """
+    Coalesces concurrent calls for the same key: the first caller runs fn,
+    the others wait for and share its result (or exception).
+    """
+    def __init__(self):
+        self._calls = {}
+        self._lock = threading.Lock()
+
+    def do(self, key, fn):
+        with self._lock:
+            future = self._calls.get(key)
+            leader = future is None
+            if leader:
+                future = self._calls[key] = Future()
+        if not leader:
+            return future.result()
+
+        try:
+            future.set_result(fn())
+        except BaseException as e:
+            future.set_exception(e)
+        finally:
+            with self._lock:
+                del self._calls[key]
+        return future.result()
+
+_cache = None
+_cache_lock = threading.Lock()
+
+def get_cache():
+    """
+    Returns the shared article cache, or None if caching is disabled.
+    """
+    global _cache
+    if not CACHE_ENABLED:
+        return None
+    with _cache_lock:
+        if _cache is None:
+            _cache = ArticleCache()
+        return _cache
@@ -0,0 +1,187 @@
+import hashlib
+import os
+import random
+import re
+import threading
+from collections import OrderedDict
+
+# Near-duplicate detection for search results (syndicated copies, tweaked headlines).
+# Each text becomes a set of word shingles, summarized by a MinHash signature;
+# signatures are split into LSH bands so only texts sharing a band are compared,
+# keeping clustering near-linear. The index lives across requests, so a story
+# seen before keeps its cluster (and representative) and signatures of repeated
+# results aren't recomputed.
+
+NUM_PERM = int(os.getenv("DEDUP_NUM_PERM", "64"))
+BANDS = int(os.getenv("DEDUP_BANDS", "16"))
+SHINGLE_SIZE = int(os.getenv("DEDUP_SHINGLE_SIZE", "2"))
+# Estimated Jaccard similarity at which two texts count as the same story
+THRESHOLD = float(os.getenv("DEDUP_THRESHOLD", "0.5"))
+# Texts remembered by the shared index before the oldest are dropped
+MAX_ENTRIES = int(os.getenv("DEDUP_MAX_ENTRIES", "20000"))
+# Also fetch and compare article bodies in search results (slower, catches rewritten headlines)
+COMPARE_BODIES = os.getenv("DEDUP_BODIES", "0") == "1"
+
+_MERSENNE = (1 << 61) - 1
+_WORD = re.compile(r"\w+")
+
+def shingles(text, size=SHINGLE_SIZE):
+    """
+    Set of size-word shingles of the lowercased text (the words themselves when shorter).
+    """
+    words = _WORD.findall(text.lower())
+    if len(words) <= size:
+        return {" ".join(words)} if words else set()
+    return {" ".join(words[i:i + size]) for i in range(len(words) - size + 1)}
+
+class MinHasher:
+    """
+    MinHash signatures from num_perm universal hash functions (a * x + b mod 2^61 - 1).
+    """
+    def __init__(self, num_perm=NUM_PERM, shingle_size=SHINGLE_SIZE, seed=1):
+        rng = random.Random(seed)
+        self.num_perm = num_perm
+        self.shingle_size = shingle_size
+        self._perms = [(rng.randrange(1, _MERSENNE), rng.randrange(0, _MERSENNE)) for _ in range(num_perm)]
+
+    def signature(self, text):
+        hashes = [int.from_bytes(hashlib.blake2b(s.encode("utf-8"), digest_size=8).digest(), "little")
+                  for s in shingles(text, self.shingle_size)]
+        if not hashes:
+            return None
+        return tuple(min((a * h + b) % _MERSENNE for h in hashes) for a, b in self._perms)
+
+def similarity(sig_a, sig_b):
+    """
+    Estimated Jaccard similarity: the fraction of matching MinHash slots.
+    """
+    return sum(x == y for x, y in zip(sig_a, sig_b)) / len(sig_a)
+
+class NearDuplicateIndex:
+    """
+    LSH index of MinHash signatures that assigns every text a cluster.
+    add(key, text) returns the cluster id, which is the key of the first text
+    seen in that story. With BANDS bands the chance two texts are compared
+    rises steeply around (1 / bands) ** (1 / rows); the exact cut is threshold.
+    """
+    def __init__(self, num_perm=NUM_PERM, bands=BANDS, threshold=THRESHOLD, max_entries=MAX_ENTRIES, hasher=None):
+        if num_perm % bands:
+            raise ValueError(f"num_perm ({num_perm}) must be a multiple of bands ({bands})")
+        self.hasher = hasher or MinHasher(num_perm)
+        self.bands = bands
+        self.rows = num_perm // bands
+        self.threshold = threshold
+        self.max_entries = max_entries
+        self._entries = OrderedDict()   # key -> (text, signature, cluster)
+        self._buckets = {}              # (band, band hash) -> set of keys
+        self._lock = threading.Lock()
+
+    def _band_keys(self, signature):
+        return [(band, hash(signature[band * self.rows:(band + 1) * self.rows])) for band in range(self.bands)]
+
+    def add(self, key, text):
+        """
+        Indexes text under key and returns its cluster id, or None for empty text.
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[0] == text:
+                self._entries.move_to_end(key)
+                return entry[2]
+            signature = self.hasher.signature(text)
+            if signature is None:
+                return None
+            if entry is not None:
+                self._remove(key)
+
+            band_keys = self._band_keys(signature)
+            best, best_score = None, self.threshold
+            candidates = set()
+            for band_key in band_keys:
+                candidates |= self._buckets.get(band_key, set())
+            for candidate in candidates:
+                score = similarity(signature, self._entries[candidate][1])
+                if score >= best_score:
+                    best, best_score = candidate, score
+            cluster = self._entries[best][2] if best is not None else key
+
+            self._entries[key] = (text, signature, cluster)
+            for band_key in band_keys:
+                self._buckets.setdefault(band_key, set()).add(key)
+            while len(self._entries) > self.max_entries:
+                self._remove(next(iter(self._entries)))
+            return cluster
+
+    def _remove(self, key):
+        _, signature, _ = self._entries.pop(key)
+        for band_key in self._band_keys(signature):
+            bucket = self._buckets.get(band_key)
+            if bucket is not None:
+                bucket.discard(key)
+                if not bucket:
+                    del self._buckets[band_key]
+
+    def cluster(self, items):
+        """
+        Clusters (key, text) pairs. Returns lists of keys, one per story, in
+        order of first appearance.
+        """
+        clusters = OrderedDict()
+        for key, text in items:
+            cluster = self.add(key, text)
+            clusters.setdefault(key if cluster is None else cluster, []).append(key)
+        return list(clusters.values())
+
+    def __len__(self):
+        return len(self._entries)
+
+def article_text(article, body=None):
+    parts = [article.get("title") or "", article.get("description") or ""]
+    if body:
+        parts.append(body)
+    return " ".join(parts)
+
+def dedupe_articles(articles, index=None, bodies=None):
+    """
+    Returns one representative article per story cluster, keeping the order
+    (and so the ranking) of the input. Articles are compared on title and
+    description; bodies=True also fetches and compares their text, which
+    catches rewritten headlines at the cost of downloading every article.
+    """
+    # An empty index is falsy (len 0), so test for None explicitly
+    if index is None:
+        index = get_index()
+    bodies = COMPARE_BODIES if bodies is None else bodies
+    texts = {}
+    if bodies:
+        from .get_content import get_contents
+        urls = [article.get("url") for article in articles if article.get("url")]
+        for url, content in zip(urls, get_contents(urls, nlp=False)):
+            if not isinstance(content, Exception):
+                texts[url] = content.get("text")
+
+    items = []
+    for position, article in enumerate(articles):
+        key = article.get("url") or f"#{position}:{article.get('title')}"
+        items.append((key, article_text(article, texts.get(article.get("url")))))
+    representatives = {cluster[0] for cluster in index.cluster(items)}
+
+    result, seen = [], set()
+    for (key, _), article in zip(items, articles):
+        if key in representatives and key not in seen:
+            seen.add(key)
+            result.append(article)
+    return result
+
+_index = None
+_index_lock = threading.Lock()
+
+def get_index():
+    """
+    Returns the shared near-duplicate index, creating it on first use.
+    """
+    global _index
+    with _index_lock:
+        if _index is None:
+            _index = NearDuplicateIndex()
+        return _index
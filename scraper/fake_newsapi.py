@@ -0,0 +1,102 @@
+import json
+import sys
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlsplit
+
+# Minimal local stand-in for NewsAPI's /v2/everything, for exercising
+# scraper.newsapi's caching, coalescing and quota backoff without spending quota.
+# Point the client at it with NEWSAPI_ENDPOINT=http://127.0.0.1:<port>/v2.
+# Usage: python -m scraper.fake_newsapi [port]
+
+def default_responder(query):
+    return [{
+        "title": f"{query} story {i}",
+        "url": f"https://example.com/{query.replace(' ', '-')}/{i}",
+        "publishedAt": "2026-01-01T00:00:00Z",
+        "source": {"id": None, "name": "Example"},
+    } for i in range(10)]
+
+class FakeNewsAPIServer:
+    """
+    Threaded HTTP server answering /v2/everything with responder(query).
+    Failures can be queued with fail_next() (429 by default, with an optional
+    Retry-After) to simulate quota exhaustion or outages.
+    """
+    def __init__(self, port=0, responder=default_responder):
+        self.responder = responder
+        self.requests = []
+        self._failures = []
+        self._lock = threading.Lock()
+        self.httpd = ThreadingHTTPServer(("127.0.0.1", port), self._handler())
+        self._thread = None
+
+    @property
+    def endpoint(self):
+        host, port = self.httpd.server_address[:2]
+        return f"http://{host}:{port}/v2"
+
+    def fail_next(self, count=1, status=429, retry_after=None):
+        with self._lock:
+            self._failures.extend([(status, retry_after)] * count)
+
+    def start(self):
+        self._thread = threading.Thread(target=self.httpd.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+    def _next_failure(self):
+        with self._lock:
+            return self._failures.pop(0) if self._failures else None
+
+    def _handler(self):
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def _send(self, status, body, headers=None):
+                data = json.dumps(body).encode("utf-8")
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(data)))
+                for name, value in (headers or {}).items():
+                    self.send_header(name, value)
+                self.end_headers()
+                self.wfile.write(data)
+
+            def do_GET(self):
+                parts = urlsplit(self.path)
+                params = {key: values[0] for key, values in parse_qs(parts.query).items()}
+                if parts.path != "/v2/everything":
+                    self._send(404, {"status": "error", "code": "notFound", "message": "Not found"})
+                    return
+
+                with server._lock:
+                    server.requests.append(params)
+                if not params.get("apiKey"):
+                    self._send(401, {"status": "error", "code": "apiKeyMissing", "message": "No API key"})
+                    return
+                failure = server._next_failure()
+                if failure is not None:
+                    status, retry_after = failure
+                    code = "rateLimited" if status == 429 else "unexpectedError"
+                    headers = {"Retry-After": str(retry_after)} if retry_after is not None else None
+                    self._send(status, {"status": "error", "code": code, "message": "Injected failure"}, headers)
+                    return
+
+                articles = server.responder(params.get("q", ""))
+                self._send(200, {"status": "ok", "totalResults": len(articles), "articles": articles})
+
+            def log_message(self, format, *args):
+                pass
+
+        return Handler
+
+if __name__ == "__main__":
+    port = int(sys.argv[1]) if len(sys.argv) > 1 else 8767
+    fake = FakeNewsAPIServer(port)
+    print(f"Fake NewsAPI listening on {fake.endpoint}")
+    fake.httpd.serve_forever()
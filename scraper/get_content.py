@@ -1,9 +1,67 @@
+import copy
+import multiprocessing
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from urllib.parse import urlsplit
 import newspaper
+import requests
+from requests.adapters import HTTPAdapter
+from .article_cache import canonical_url, get_cache, SingleFlight
 
 print("newspaper has been imported.")
 
-def get_content(url):
-    article = newspaper.article(url)
+FETCH_TIMEOUT = float(os.getenv("SCRAPER_FETCH_TIMEOUT", "10"))
+HEADERS = {"User-Agent": newspaper.Config().browser_user_agent}
+# Downloads in flight at once for get_contents, and at most this many to any one host
+MAX_WORKERS = int(os.getenv("SCRAPER_MAX_WORKERS", "16"))
+PER_HOST = int(os.getenv("SCRAPER_PER_HOST", "4"))
+# Processes parsing HTML for get_contents; each is a separate interpreter with
+# newspaper loaded (~70 MiB RSS), so the default stays small on many-core hosts
+PARSE_WORKERS = int(os.getenv("SCRAPER_PARSE_WORKERS", str(min(4, os.cpu_count() or 1))))
+# Computed with newspaper's nlp(), only when first accessed
+NLP_FIELDS = ("keywords", "summary")
+
+_session = requests.Session()
+_adapter = HTTPAdapter(pool_connections=MAX_WORKERS, pool_maxsize=MAX_WORKERS)
+_session.mount("http://", _adapter)
+_session.mount("https://", _adapter)
+_host_limits = {}
+_host_lock = threading.Lock()
+# Concurrent requests for the same article share one download and parse
+_inflight = SingleFlight()
+
+def _host_limit(url):
+    host = urlsplit(url).netloc.lower()
+    with _host_lock:
+        if host not in _host_limits:
+            _host_limits[host] = threading.Semaphore(PER_HOST)
+        return _host_limits[host]
+
+def fetch_html(url, etag=None, last_modified=None):
+    """
+    Downloads url, sending validators from a cached copy when there is one.
+    Returns the response; status 304 means the cached copy is still current.
+    """
+    headers = dict(HEADERS)
+    if etag:
+        headers["If-None-Match"] = etag
+    if last_modified:
+        headers["If-Modified-Since"] = last_modified
+    with _host_limit(url):
+        response = _session.get(url, headers=headers, timeout=FETCH_TIMEOUT)
+    if response.status_code != 304:
+        response.raise_for_status()
+    return response
+
+def parse_article(url, html, nlp=False):
+    """
+    Parses downloaded HTML into the article fields.
+    keywords and summary are only included with nlp=True.
+    """
+    article = newspaper.Article(url)
+    article.download(input_html=html)
+    article.parse()
 
     # Article content
     authors = article.authors
@@ -11,27 +69,189 @@ def get_content(url):
         date = article.publish_date.strftime("%Y-%m-%d")
     else:
         date = "No Date"
-    text = article.text
-    top_image = article.top_image
-
-    # Natural Language Processing
-    article.nlp()
-    keywords = article.keywords
-    summary = article.summary
-    title = article.title
 
     content_dict = {
-        "title": title,
+        "title": article.title,
         "authors" : authors,
         "date" : date,
-        "text" : text,
-        "top_image" : top_image,
-        "keywords" : keywords,
-        "summary" : summary
+        "text" : article.text,
+        "top_image" : article.top_image,
     }
 
+    # Natural Language Processing
+    if nlp:
+        content_dict.update(article_nlp(article))
+
     return content_dict
 
+def article_nlp(article):
+    """
+    Runs newspaper's nlp() on a parsed Article and returns keywords and summary.
+    """
+    article.nlp()
+    return {"keywords": article.keywords, "summary": article.summary}
+
+def fields_nlp(url, fields):
+    """
+    keywords and summary for already-parsed fields. nlp() only reads the title
+    and text, so the HTML isn't parsed again.
+    """
+    article = newspaper.Article(url)
+    article.title = fields.get("title") or ""
+    article.text = fields.get("text") or ""
+    article.is_parsed = True
+    return article_nlp(article)
+
+class LazyNLP:
+    """
+    Runs compute() once, on first use, and shares the result between every
+    ArticleContent made from the same fetch.
+    """
+    def __init__(self, compute):
+        self._compute = compute
+        self._value = None
+        self._lock = threading.Lock()
+
+    def get(self):
+        with self._lock:
+            if self._value is None:
+                try:
+                    self._value = self._compute()
+                except Exception as e:
+                    print(f"Article NLP failed: {e}")
+                    self._value = {"keywords": [], "summary": ""}
+            return self._value
+
+class ArticleContent(dict):
+    """
+    Article fields as a dict. keywords and summary are filled in on first
+    access (content["summary"] or content.get("summary")) when nlp is given.
+    """
+    def __init__(self, fields, nlp=None):
+        super().__init__(fields)
+        self._nlp = nlp
+
+    def _load_nlp(self):
+        if self._nlp is not None:
+            # The LazyNLP result is shared; each caller gets its own keyword list
+            self.update(copy.deepcopy(self._nlp.get()))
+            self._nlp = None
+
+    def __missing__(self, key):
+        if key in NLP_FIELDS and self._nlp is not None:
+            self._load_nlp()
+            return self[key]
+        raise KeyError(key)
+
+    def get(self, key, default=None):
+        if key in NLP_FIELDS and not dict.__contains__(self, key):
+            self._load_nlp()
+        return dict.get(self, key, default)
+
+def _nlp_fields(url, key, fields):
+    nlp = fields_nlp(url, fields)
+    cache = get_cache()
+    if cache:
+        cache.merge_result(key, nlp)
+    return nlp
+
+def _origin_unavailable(error):
+    """
+    True for connection failures and 5xx responses; a 4xx (404, 410, ...) is a real answer.
+    """
+    response = getattr(error, "response", None)
+    if response is None:
+        return isinstance(error, (requests.ConnectionError, requests.Timeout))
+    return response.status_code >= 500
+
+def _load_content(url, key, parse=parse_article):
+    """
+    Returns (fields, nlp) for url from the cache or the network.
+    nlp is the shared LazyNLP, or None when the fields already include it.
+    """
+    cache = get_cache()
+    entry = cache.get(key) if cache else None
+    if entry and entry["fresh"]:
+        return _loaded(url, key, entry["result"])
+
+    validators = (entry["etag"], entry["last_modified"]) if entry else ()
+    try:
+        response = fetch_html(url, *validators)
+    except requests.RequestException as e:
+        # Serve a stale copy rather than fail while the origin is down
+        if entry and _origin_unavailable(e):
+            return _loaded(url, key, entry["result"])
+        raise
+
+    if response.status_code == 304 and entry:
+        cache.touch(key)
+        return _loaded(url, key, entry["result"])
+
+    # Raw bytes: the parser detects the encoding (requests assumes ISO-8859-1 without a charset)
+    html = response.content
+    content_dict = parse(url, html)
+    if cache:
+        cache.set(key, html, content_dict,
+                  response.headers.get("ETag"), response.headers.get("Last-Modified"))
+    return _loaded(url, key, content_dict)
+
+def _loaded(url, key, fields):
+    if all(field in fields for field in NLP_FIELDS):
+        return fields, None
+    return fields, LazyNLP(lambda: _nlp_fields(url, key, fields))
+
+def _content(loaded, nlp):
+    fields, lazy_nlp = loaded
+    # Callers sharing one in-flight result each get their own copy
+    return ArticleContent(copy.deepcopy(fields), lazy_nlp if nlp else None)
+
+def get_content(url, nlp=True):
+    """
+    Downloads and parses an article. Results are cached by canonical URL (see
+    scraper/article_cache.py), and simultaneous requests for the same URL are
+    coalesced into one fetch.
+    keywords and summary are computed on first access; nlp=False leaves them out.
+    """
+    key = canonical_url(url)
+    return _content(_inflight.do(key, lambda: _load_content(url, key)), nlp)
+
+_parse_pool = None
+_parse_pool_lock = threading.Lock()
+
+def _get_parse_pool():
+    global _parse_pool
+    with _parse_pool_lock:
+        if _parse_pool is None:
+            _parse_pool = ProcessPoolExecutor(
+                max_workers=PARSE_WORKERS,
+                mp_context=multiprocessing.get_context("spawn")
+            )
+        return _parse_pool
+
+def _parse_in_pool(url, html):
+    return _get_parse_pool().submit(parse_article, url, html).result()
+
+def get_contents(urls, nlp=True, max_workers=None):
+    """
+    Batch get_content: downloads urls concurrently over the pooled session
+    (at most SCRAPER_PER_HOST at a time per host) and parses them in a pool of
+    SCRAPER_PARSE_WORKERS processes.
+    Returns one result per url in order; a url that failed gets its exception
+    instead of an ArticleContent.
+    With nlp=False, keywords and summary are never computed.
+    """
+    urls = list(urls)
+
+    def load(url):
+        key = canonical_url(url)
+        try:
+            return _content(_inflight.do(key, lambda: _load_content(url, key, _parse_in_pool)), nlp)
+        except Exception as e:
+            return e
+
+    with ThreadPoolExecutor(max_workers=max_workers or MAX_WORKERS) as executor:
+        return list(executor.map(load, urls))
+
 if __name__ == "__main__":
     content_dict = get_content("https://www.cnn.com/2026/02/14/politics/former-federal-workers-doge-cuts")
     print(content_dict['text'])
@@ -0,0 +1,207 @@
+import os
+import random
+import threading
+import time
+from collections import OrderedDict
+from datetime import date, timedelta
+import requests
+from dotenv import load_dotenv
+from .article_cache import SingleFlight
+
+# NewsAPI /v2/everything client used for "similar articles".
+# One persistent session; results cached for NEWSAPI_CACHE_TTL seconds per
+# (normalized query, date window), so a popular topic costs one upstream call
+# per TTL instead of one per page view. Identical concurrent queries share a
+# single request. When NewsAPI reports we're out of quota the client backs off
+# (Retry-After, or a doubling pause) and serves stale results meanwhile.
+# NEWSAPI_ENDPOINT can point at a local stand-in (see scraper/fake_newsapi.py).
+
+load_dotenv()
+
+ENDPOINT = os.getenv("NEWSAPI_ENDPOINT", "https://newsapi.org/v2")
+# Articles published within the last NEWSAPI_WINDOW_DAYS days
+WINDOW_DAYS = int(os.getenv("NEWSAPI_WINDOW_DAYS", "7"))
+SORT_BY = os.getenv("NEWSAPI_SORT_BY", "popularity")
+CACHE_TTL = float(os.getenv("NEWSAPI_CACHE_TTL", "600"))
+# Entries kept (fresh or stale) in the in-process cache
+CACHE_ENTRIES = int(os.getenv("NEWSAPI_CACHE_ENTRIES", "512"))
+TIMEOUT = float(os.getenv("NEWSAPI_TIMEOUT", "10"))
+MAX_RETRIES = int(os.getenv("NEWSAPI_MAX_RETRIES", "2"))
+BACKOFF_BASE = float(os.getenv("NEWSAPI_BACKOFF_BASE", "1"))
+BACKOFF_MAX = float(os.getenv("NEWSAPI_BACKOFF_MAX", "300"))
+# First pause after running out of quota without a Retry-After; doubles on each repeat up to NEWSAPI_BACKOFF_MAX
+QUOTA_BACKOFF = float(os.getenv("NEWSAPI_QUOTA_BACKOFF", "60"))
+
+RETRYABLE_STATUS_CODES = {500, 502, 503, 504}
+# NewsAPI error codes meaning this key can't make more requests for now
+QUOTA_CODES = {"rateLimited", "apiKeyExhausted"}
+
+class NewsAPIError(Exception):
+    """
+    NewsAPI request failed (bad request, auth, upstream error, ...).
+    """
+    def __init__(self, message, status=None, code=None):
+        super().__init__(message)
+        self.status = status
+        self.code = code
+
+class NewsAPIQuotaError(NewsAPIError):
+    """
+    NewsAPI quota is exhausted and no cached result could be served.
+    retry_at is the time.time() when the client will try upstream again.
+    """
+    def __init__(self, message, retry_at, status=429, code="rateLimited"):
+        super().__init__(message, status, code)
+        self.retry_at = retry_at
+
+# Boolean operators are case-sensitive in NewsAPI queries; everything else isn't
+OPERATORS = {"AND", "OR", "NOT"}
+
+def normalize_query(query):
+    """
+    Cache key form of a query: whitespace collapsed and words lowercased, except
+    the AND / OR / NOT operators, which change the query's meaning.
+    """
+    return " ".join(word if word in OPERATORS else word.lower() for word in query.split())
+
+def backoff_delay(attempt, base=BACKOFF_BASE, cap=BACKOFF_MAX):
+    """
+    Full-jitter exponential backoff for the given attempt (0-based).
+    """
+    return random.uniform(0, min(cap, base * (2 ** attempt)))
+
+class NewsAPIClient:
+    """
+    Cached, coalescing, quota-aware client for NewsAPI's /everything endpoint.
+    """
+    def __init__(self, api_key=None, endpoint=ENDPOINT, ttl=CACHE_TTL, window_days=WINDOW_DAYS,
+                 sort_by=SORT_BY, max_entries=CACHE_ENTRIES, max_retries=MAX_RETRIES, sleep=time.sleep):
+        self.api_key = api_key if api_key is not None else os.getenv("NEWSAPI_KEY")
+        self.endpoint = endpoint.rstrip("/")
+        self.ttl = ttl
+        self.window_days = window_days
+        self.sort_by = sort_by
+        self.max_entries = max_entries
+        self.max_retries = max_retries
+        self.sleep = sleep
+        self.session = requests.Session()
+        self.upstream_calls = 0
+        self._cache = OrderedDict()
+        self._lock = threading.Lock()
+        self._inflight = SingleFlight()
+        self._blocked_until = 0.0
+        self._quota_failures = 0
+
+    def _window(self):
+        return (date.today() - timedelta(days=self.window_days)).isoformat()
+
+    def _cached(self, key):
+        """
+        Returns (articles, fresh) for key, or (None, False) on a miss.
+        """
+        with self._lock:
+            entry = self._cache.get(key)
+            if entry is None:
+                return None, False
+            self._cache.move_to_end(key)
+            fetched_at, articles = entry
+            return articles, time.time() - fetched_at < self.ttl
+
+    def _store(self, key, articles):
+        with self._lock:
+            self._cache[key] = (time.time(), articles)
+            self._cache.move_to_end(key)
+            while len(self._cache) > self.max_entries:
+                self._cache.popitem(last=False)
+
+    def everything(self, query):
+        """
+        Returns the articles NewsAPI has for query within the date window.
+        Served from cache while fresh; identical concurrent calls share one request.
+        """
+        key = (normalize_query(query), self._window(), self.sort_by)
+        articles, fresh = self._cached(key)
+        if fresh:
+            return list(articles)
+        return list(self._inflight.do(key, lambda: self._refresh(key, query, articles)))
+
+    def _refresh(self, key, query, stale):
+        # Another caller may have refreshed it while we waited for the in-flight slot
+        articles, fresh = self._cached(key)
+        if fresh:
+            return articles
+
+        now = time.time()
+        if now < self._blocked_until:
+            if stale is not None:
+                return stale
+            raise NewsAPIQuotaError("NewsAPI quota exhausted; backing off", self._blocked_until)
+
+        try:
+            # Upstream gets the caller's query; only the cache key is normalized
+            articles = self._request(query, *key[1:])
+        except NewsAPIError:
+            # Quota or upstream trouble: stale results beat an error page
+            if stale is not None:
+                return stale
+            raise
+        self._store(key, articles)
+        return articles
+
+    def _request(self, query, from_date, sort_by):
+        params = {"q": query, "from": from_date, "sortBy": sort_by, "apiKey": self.api_key}
+        for attempt in range(self.max_retries + 1):
+            with self._lock:
+                self.upstream_calls += 1
+            try:
+                response = self.session.get(f"{self.endpoint}/everything", params=params, timeout=TIMEOUT)
+            except requests.RequestException as e:
+                if attempt < self.max_retries:
+                    self.sleep(backoff_delay(attempt))
+                    continue
+                raise NewsAPIError(f"NewsAPI request failed: {e}")
+
+            if response.status_code == 200:
+                self._quota_failures = 0
+                return response.json().get("articles", [])
+
+            try:
+                body = response.json()
+            except ValueError:
+                body = {}
+            code = body.get("code")
+            message = body.get("message") or f"NewsAPI returned HTTP {response.status_code}"
+
+            if response.status_code == 429 or code in QUOTA_CODES:
+                self._back_off(response.headers.get("Retry-After"))
+                raise NewsAPIQuotaError(message, self._blocked_until, response.status_code, code)
+            if response.status_code in RETRYABLE_STATUS_CODES and attempt < self.max_retries:
+                self.sleep(backoff_delay(attempt))
+                continue
+            raise NewsAPIError(message, response.status_code, code)
+
+    def _back_off(self, retry_after):
+        with self._lock:
+            try:
+                delay = float(retry_after)
+            except (TypeError, ValueError):
+                delay = min(BACKOFF_MAX, QUOTA_BACKOFF * (2 ** self._quota_failures))
+            self._quota_failures += 1
+            self._blocked_until = max(self._blocked_until, time.time() + delay)
+
+    def clear(self):
+        with self._lock:
+            self._cache.clear()
+
+_client = None
+_client_lock = threading.Lock()
+
+def get_client():
+    """
+    Returns the shared NewsAPI client, creating it on first use.
+    """
+    global _client
+    with _client_lock:
+        if _client is None:
+            _client = NewsAPIClient()
+        return _client
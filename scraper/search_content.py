@@ -1,44 +1,14 @@
-import os
-import requests
-from dotenv import load_dotenv
-
-load_dotenv()
-api_key = os.getenv("NEWSAPI_KEY")
+from .newsapi import get_client, NewsAPIError
+from .dedup import dedupe_articles
 
 def search_urls(query, url="xooks rbo admits megaorz 1434 exudes xiooix"):
     url = url.strip().lower()
 
-    u = ('https://newsapi.org/v2/everything?'
-       f'q={query}&'
-       'from=2026-02-13&'
-       'sortBy=popularity&'
-       f'apiKey={api_key}')
-    response = requests.get(u)
-
-    if response.status_code == 200:
-        data = response.json()
-        articles = data.get("articles", [])
-        
-        unique_articles = []
-        seen_titles = set()
-
-        for article in articles:
-            title = article['title'].strip().lower()
-            
-            if title not in seen_titles and article['url'].strip().lower() != url:
-                seen_titles.add(title)
-                unique_articles.append(article)
-            
-            if len(unique_articles) == 5:
-                break
-
-        ans = []
-        for i, article in enumerate(unique_articles, 1):
-            ans.append(article)
-        return ans
-    else:
-        print(f"Error: {response.status_code}")
-        print(response.json())
+    try:
+        articles = get_client().everything(query)
+    except NewsAPIError as e:
+        print(f"Error: {e.status} {e.code}")
+        print(e)
         return [{
             'title' : 'No similar articles could be found',
             'publishedAt' : '',
@@ -46,6 +16,25 @@ def search_urls(query, url="xooks rbo admits megaorz 1434 exudes xiooix"):
             'url' : ''
         }]
 
+    # One article per story: syndicated copies and reworded headlines collapse into their first hit
+    articles = [article for article in articles if (article.get('url') or '').strip().lower() != url]
+    articles = dedupe_articles(articles)
+
+    unique_articles = []
+    seen_titles = set()
+
+    for article in articles:
+        title = (article.get('title') or '').strip().lower()
+
+        if title not in seen_titles:
+            seen_titles.add(title)
+            unique_articles.append(article)
+
+        if len(unique_articles) == 5:
+            break
+
+    return unique_articles
+
 if __name__ == "__main__":
     openai = search_urls("openai", "https://www.wired.com/story/openai-nuking-4o-model-china-chatgpt-fans-arent-ok/")
     print(f"--- 5 Unique Latest Articles regarding OpenAI\n")
@@ -53,4 +42,4 @@ if __name__ == "__main__":
         print(f"{i}. {article['title']}")
         print(f"   Published: {article['publishedAt']}")
         print(f"   Source: {article['source']['name']}")
-        print(f"   Link: {article['url']}\n")
\ No newline at end of file
+        print(f"   Link: {article['url']}\n")